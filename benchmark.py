@@ -0,0 +1,259 @@
+"""Offline micro-benchmarks for the gig finder's per-listing stages.
+
+Runs keyword matching, exclusion, duplicate detection and HTML parsing
+against the hand-written sample pages in fixtures/ plus synthetic titles,
+and reports throughput and peak memory for each stage. No network access
+is needed.
+
+    python benchmark.py                      # print a report
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+
+--compare exits with status 1 when a stage's throughput drops, or its peak
+memory grows, by more than the threshold relative to the saved baseline.
+"""
+import argparse
+import gc
+import glob
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import requests
+
+from main import (
+    CraigslistGigFinder,
+    LISTING_EXTRACTORS,
+    PostingDateExtractor,
+    lxml_html,
+    parse_posting_date,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+TITLE_WORDS = [
+    'web', 'developer', 'wordpress', 'site', 'python', 'script', 'react', 'native', 'app', 'help', 'needed',
+    'moving', 'cleaning', 'focus', 'group', 'survey', 'paid', 'research', 'study', 'driver', 'delivery',
+    'logo', 'design', 'shopify', 'store', 'full', 'stack', 'backend', 'front-end', 'aws', 'cloud', 'devops',
+    'java', 'tutor', 'remote', 'asap', 'cash', 'weekend', 'ui/ux', 'html', 'css', 'data', 'entry', '$50', '!!!',
+]
+
+
+def synthetic_titles(count: int, seed: int = 1) -> List:
+    """Deterministic pseudo-gig titles, about a fifth of them repeats."""
+    rnd = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        if titles and rnd.random() < 0.2:
+            titles.append(rnd.choice(titles))
+        else:
+            titles.append(' '.join(rnd.choice(TITLE_WORDS) for _ in range(rnd.randint(3, 9))).title())
+    return titles
+
+
+def load_fixtures(prefix: str) -> List:
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, f'{prefix}_*.html')))
+    if not paths:
+        raise SystemExit(f"No {prefix}_*.html fixtures found in {FIXTURES_DIR}")
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def streamed_response(body: bytes) -> requests.Response:
+    """Build a requests Response that streams body the way a real stream=True response does."""
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response.headers['Content-Length'] = str(len(body))
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def build_stages(finder: CraigslistGigFinder, titles: List, search_pages: List, posting_pages: List) -> Dict:
+    """Return {stage name: (unit, items per call, setup, fn)}.
+
+    setup() runs untimed before every call and returns fn's argument, so
+    stateful stages such as dedup start from the same empty state each time.
+    """
+    links = [f'https://sfbay.craigslist.org/cpg/d/{i % (len(titles) * 4 // 5)}.html' for i in range(len(titles))]
+    posting_bodies = [page.encode('utf-8') for page in posting_pages]
+    search_listings = sum(len(LISTING_EXTRACTORS['soup']().extract(page)) for page in search_pages)
+
+    def match(_):
+        for title in titles:
+            finder.matches_tech_keywords(title)
+
+    def exclude(_):
+        for title in titles:
+            finder.should_exclude(title)
+
+    def reset_dedup():
+        finder.seen_titles = set()
+        finder.seen_links = set()
+
+    def dedup(_):
+        for title, link in zip(titles, links):
+            finder.is_duplicate(title, link)
+
+    def extract_with(extractor):
+        def extract(_):
+            for page in search_pages:
+                extractor.extract(page)
+        return extract
+
+    def streamed_responses():
+        return [streamed_response(body) for body in posting_bodies]
+
+    def posting_date_stream(responses):
+        extractor = PostingDateExtractor()
+        for response in responses:
+            extractor.extract(response)
+
+    def posting_date_full(_):
+        for page in posting_pages:
+            parse_posting_date(page)
+
+    stages = {
+        'matching': ('titles', len(titles), None, match),
+        'exclusion': ('titles', len(titles), None, exclude),
+        'dedup': ('titles', len(titles), reset_dedup, dedup),
+        'parse_soup': ('listings', search_listings, None, extract_with(LISTING_EXTRACTORS['soup']())),
+        'posting_date_stream': ('pages', len(posting_pages), streamed_responses, posting_date_stream),
+        'posting_date_full': ('pages', len(posting_pages), None, posting_date_full),
+    }
+    if lxml_html is not None:
+        stages['parse_lxml'] = ('listings', search_listings, None, extract_with(LISTING_EXTRACTORS['lxml']()))
+    return stages
+
+
+def measure(setup, fn, repeat: int) -> Dict:
+    """Best-of-repeat wall time, then one separate run under tracemalloc for peak memory."""
+    best = float('inf')
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        # Like timeit, keep collector pauses out of the timings
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn(arg)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    # Timed runs stay outside tracemalloc, which slows allocation-heavy code a lot
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_kb': peak / 1024}
+
+
+def check_parser_parity(search_pages: List) -> Optional[str]:
+    """Return a description of the first soup/lxml disagreement, or None when they agree."""
+    if lxml_html is None:
+        return None
+    soup, lxml = LISTING_EXTRACTORS['soup'](), LISTING_EXTRACTORS['lxml']()
+    for i, page in enumerate(search_pages):
+        expected, actual = soup.extract(page), lxml.extract(page)
+        if expected != actual:
+            return f"search fixture {i}: soup found {len(expected)} listings, lxml {len(actual)}"
+    return None
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List:
+    """Return a message for every stage that regressed beyond threshold."""
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get(stage)
+        if previous is None:
+            continue
+        if current['per_sec'] < previous['per_sec'] * (1 - threshold):
+            regressions.append(f"{stage}: {current['per_sec']:,.0f} {current['unit']}/s, "
+                               f"baseline {previous['per_sec']:,.0f} ({current['per_sec'] / previous['per_sec'] - 1:+.0%})")
+        if current['peak_kb'] > previous['peak_kb'] * (1 + threshold) and current['peak_kb'] - previous['peak_kb'] > 64:
+            regressions.append(f"{stage}: peak memory {current['peak_kb']:,.0f} KiB, "
+                               f"baseline {previous['peak_kb']:,.0f} KiB")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Offline benchmarks for matching, exclusion, dedup and parsing.')
+    parser.add_argument('--titles', type=int, default=20000, help='number of synthetic titles')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per stage (best is reported)')
+    parser.add_argument('--stage', action='append', help='only run this stage (may be repeated)')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed relative slowdown or memory growth before --compare fails (default 0.15)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    search_pages = load_fixtures('search')
+    posting_pages = load_fixtures('posting')
+
+    finder = CraigslistGigFinder(max_workers=1, enrich=False, cache_path=None, yield_store_path=None)
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        mismatch = check_parser_parity(search_pages)
+        if mismatch:
+            print(f"Parser parity check failed: {mismatch}")
+            return 1
+
+        titles = synthetic_titles(args.titles)
+        stages = build_stages(finder, titles, search_pages, posting_pages)
+        if args.stage:
+            unknown = set(args.stage) - set(stages)
+            if unknown:
+                raise SystemExit(f"Unknown stage(s): {', '.join(sorted(unknown))}; choose from {', '.join(stages)}")
+            stages = {name: stage for name, stage in stages.items() if name in args.stage}
+
+        results = {}
+        print(f"{'stage':<22}{'throughput':>24}{'per item':>12}{'peak memory':>14}")
+        for name, (unit, items, setup, fn) in stages.items():
+            timing = measure(setup, fn, args.repeat)
+            results[name] = {
+                'unit': unit,
+                'items': items,
+                'per_sec': items / timing['seconds'],
+                'peak_kb': timing['peak_kb'],
+            }
+            print(f"{name:<22}{results[name]['per_sec']:>16,.0f} {unit + '/s':<10}"
+                  f"{timing['seconds'] / items * 1e6:>8.1f} us{timing['peak_kb']:>10,.0f} KiB")
+    finally:
+        finder.close()
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo stage regressed beyond {args.threshold:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Lets the tests under tests/ import main.py from the repository root."""
@@ -0,0 +1,262 @@
+"""End-to-end load harness against a local Craigslist stand-in server.
+
+Starts a threaded HTTP server that generates search pages for
+/{site}/search/{cpg,crg,ggg} and posting pages for the links on them, for
+any number of fake site codes, with configurable latency, 5xx errors and
+429 throttling. A full run_search crawl is pointed at it through base_url,
+and wall time, request rate and the latency distribution are reported.
+
+    python loadtest.py --sites 300 1000 3000 --latency 0.05 --throttle-rate 0.01
+    python loadtest.py --serve 8000   # then: python main.py --base-url 'http://127.0.0.1:8000/{site}'
+"""
+import argparse
+import html
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+from main import CraigslistGigFinder
+
+TITLES = [
+    'WordPress developer needed', 'Shopify store setup', 'Python script for scraping', 'React Native app help',
+    'Full stack dev for MVP', 'Fix website CSS', 'AWS cloud migration', 'iOS developer wanted', 'UI/UX designer',
+    'Moving help Saturday', 'House cleaning', 'Delivery driver', 'Paid focus group', 'Dog walker', 'Yard work',
+    'Event staff', 'Furniture assembly', 'Painter needed', 'Data entry', 'Photographer for event',
+]
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fault settings and per-status counts."""
+
+    daemon_threads = True
+
+    def __init__(self, address, listings: int = 40, latency: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: int = 1, pages: int = 1):
+        super().__init__(address, StandInHandler)
+        self.listings = listings
+        self.pages = pages
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.status_counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def count(self, status: int):
+        with self._lock:
+            self.status_counts[status] += 1
+
+    def reset_counts(self):
+        with self._lock:
+            self.status_counts.clear()
+
+    def handle_error(self, request, client_address):
+        # The crawler drops connections on purpose, e.g. closing a streamed
+        # posting page early or a 429 it is about to retry; don't print those
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves /{site}/search/{section}[?s=offset] and /{site}/{section}/d/{slug}/{id}.html."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(random.uniform(0.5, 1.5) * server.latency)
+
+        roll = random.random()
+        if roll < server.throttle_rate:
+            return self.reply(429, 'Too Many Requests', {'Retry-After': str(server.retry_after)})
+        if roll < server.throttle_rate + server.error_rate:
+            return self.reply(500, 'Internal Server Error')
+
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 3 and parts[1] == 'search':
+            offset = int(parse_qs(url.query).get('s', ['0'])[0])
+            return self.reply(200, self.search_page(parts[0], parts[2], offset))
+        if len(parts) >= 3 and parts[-1].endswith('.html'):
+            return self.reply(200, self.posting_page(parts[-1][:-len('.html')]))
+        return self.reply(404, 'Not Found')
+
+    def reply(self, status: int, body: str, headers: Dict[str, str] = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(status)
+
+    def search_page(self, site: str, section: str, offset: int = 0) -> str:
+        # Seeded by site/section so every crawl sees the same postings, newest
+        # first, with IDs and posted times decreasing down the pages
+        rnd = random.Random(f'{site}/{section}')
+        base = f'http://{self.headers.get("Host")}/{site}/{section}/d'
+        now = datetime.now().replace(microsecond=0)
+        pid = rnd.randint(7800000000, 7999999999)
+        items = []
+        for i in range(self.server.listings * self.server.pages):
+            title = rnd.choice(TITLES)
+            if rnd.random() < 0.5:
+                # Half unique postings, half reposts shared across sites
+                title += f' - {site} #{rnd.randint(1, 999)}'
+            title = html.escape(title)
+            pid -= rnd.randint(1, 5000)
+            posted = (now - timedelta(minutes=37 * i)).strftime('%Y-%m-%d %H:%M')
+            price = rnd.randint(20, 500)
+            if offset <= i < offset + self.server.listings:
+                items.append(
+                    f'<li class="cl-static-search-result" title="{title}"><a href="{base}/gig/{pid}.html">'
+                    f'<div class="title">{title}</div><div class="details"><div class="price">${price}</div>'
+                    f'<div class="location">{site}</div></div></a>'
+                    f'<time datetime="{posted}"></time></li>')
+        return '<html><body><ol class="cl-static-search-results">' + ''.join(items) + '</ol></body></html>'
+
+    def posting_page(self, pid: str) -> str:
+        day = int(pid) % 28 + 1
+        return ('<html><body><section id="postingbody">' + 'Gig details. ' * 200 + '</section>'
+                '<div class="postinginfos"><p class="postinginfo">post id: ' + pid + '</p>'
+                f'<p class="postinginfo reveal">Posted <time class="date timeago" datetime="2024-03-{day:02d}T09:00:00-0700" '
+                f'title="2024-03-{day:02d} 09:00">{day} days ago</time></p></div></body></html>')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * (len(values) - 1) + 0.5))]
+
+
+def run_crawl(server: StandInServer, site_count: int, args) -> Dict:
+    """Crawl site_count fake sites on the stand-in server and return the measurements."""
+    host, port = server.server_address[:2]
+    results_dir = tempfile.mkdtemp(prefix='gig_loadtest_')
+    finder = CraigslistGigFinder(
+        max_workers=args.workers,
+        per_host_limit=args.per_host,
+        request_delay=args.delay,
+        max_host_rate=args.max_host_rate,
+        global_rate=args.global_rate,
+        retries=args.retries,
+        enrich=not args.no_enrich,
+        detail_workers=args.detail_workers,
+        cache_path=None,
+        yield_store_path=None,
+        pool_maxsize=args.pool_size or args.workers + args.detail_workers,
+        max_pages=args.max_pages,
+        page_size=args.listings,
+        processes=args.processes,
+        base_url=f'http://{host}:{port}/{{site}}',
+    )
+    # Retry warnings are summarized in the report instead
+    logging.getLogger().setLevel(logging.ERROR)
+    finder.results_dir = results_dir
+    finder.craigslist_sites = {f'Site {i}': f'site{i}' for i in range(site_count)}
+
+    # Client-side latency (time to response headers) of every request, retries included
+    latencies = []
+    finder.transport.session.hooks['response'].append(
+        lambda response, *a, **kw: latencies.append(response.elapsed.total_seconds()))
+
+    server.reset_counts()
+    start = time.perf_counter()
+    try:
+        results = finder.run_search()
+    finally:
+        finder.close()
+        shutil.rmtree(results_dir, ignore_errors=True)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'sites': site_count,
+        'wall': wall,
+        'requests': len(latencies),
+        'rate': len(latencies) / wall if wall else 0.0,
+        'p50': percentile(latencies, 0.5),
+        'p90': percentile(latencies, 0.9),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1] if latencies else 0.0,
+        'throttled': server.status_counts[429],
+        'errors': server.status_counts[500],
+        'gigs': results['total_results'],
+        'retried': results['request_report']['retried'],
+        'failed': results['request_report']['failed'],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load test the crawler against a local Craigslist stand-in.')
+    parser.add_argument('--sites', type=int, nargs='+', default=[300], help='fake site counts to crawl, one run each')
+    parser.add_argument('--listings', type=int, default=40, help='listings per search page')
+    parser.add_argument('--pages', type=int, default=1, help='search result pages per section')
+    parser.add_argument('--latency', type=float, default=0.02, help='mean server response delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429 responses')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='only run the stand-in server on this port')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--per-host', type=int, default=1)
+    parser.add_argument('--delay', type=float, default=2.0)
+    parser.add_argument('--max-host-rate', type=float, default=2.0)
+    parser.add_argument('--global-rate', type=float, default=20.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--detail-workers', type=int, default=4)
+    parser.add_argument('--no-enrich', action='store_true')
+    parser.add_argument('--max-pages', type=int, default=1, help='search result pages the crawler reads per section')
+    parser.add_argument('--processes', type=int, default=0, help='parse pool processes for the crawler')
+    parser.add_argument('--pool-size', type=int,
+                        help='keep-alive connections to the server (default: workers + detail workers, '
+                             'since every fake site shares the one local host)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = StandInServer(('127.0.0.1', args.serve or 0), args.listings, args.latency,
+                           args.error_rate, args.throttle_rate, args.retry_after, args.pages)
+
+    if args.serve:
+        print(f"Serving Craigslist stand-in on http://127.0.0.1:{args.serve}/{{site}}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(f"{'sites':>6}{'requests':>10}{'wall s':>9}{'req/s':>8}{'p50 ms':>9}{'p90 ms':>9}"
+              f"{'p99 ms':>9}{'max ms':>9}{'429s':>7}{'500s':>7}{'retried':>9}{'failed':>8}{'gigs':>7}")
+        for site_count in args.sites:
+            r = run_crawl(server, site_count, args)
+            print(f"{r['sites']:>6}{r['requests']:>10}{r['wall']:>9.1f}{r['rate']:>8.1f}"
+                  f"{r['p50'] * 1000:>9.1f}{r['p90'] * 1000:>9.1f}{r['p99'] * 1000:>9.1f}{r['max'] * 1000:>9.1f}"
+                  f"{r['throttled']:>7}{r['errors']:>7}{r['retried']:>9}{r['failed']:>8}{r['gigs']:>7}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,596 +1,1831 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+from bs4 import BeautifulSoup, NavigableString
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml is optional; the BeautifulSoup extractor is used instead
+    lxml_html = None
 import json
 from datetime import datetime, timedelta
 import time
 import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import hashlib
+import heapq
+import math
 import os
-from typing import Dict, List, Optional
+import queue
+import random
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import codecs
 import logging
+import multiprocessing
 
 
-class CraigslistGigFinder:
+class Metrics:
+    """Thread-safe counters and latency histograms for the crawl pipeline.
+
+    Series are identified by a name plus keyword labels, e.g.
+    observe('stage_seconds', 0.2, stage='search_fetch', site='sfbay'), and can
+    be exported as a JSON block or in the Prometheus text format.
+    """
+
+    enabled = True
+    PREFIX = 'gigfinder_'
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
     def __init__(self):
-        # Set up logging
-        self.setup_logging()
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += amount
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.BUCKETS):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
 
-        # Define keyword groups with context
-        self.keyword_groups = {
-            'web_dev': [
-                r'\bweb\s+(?:developer|development|designer?|design)\b',
-                r'\bwordpress\b',
-                r'\bshopify\b',
-                r'\bwix\b',
-                r'\bsquarespace\b',
-                r'\bwebsite\s+(?:developer?|development|designer?|design)\b',
-                r'\bfront[\s-]*end\b',
-                r'\bback[\s-]*end\b',
-                r'\bfull[\s-]*stack\b',
-                r'\bweb\s+programmer\b',
-                r'\bui\s*/?\s*ux\b',
-                r'\bhtml\b',
-                r'\bcss\b',
-                r'\bbootstrap\b',
-                r'\btailwind\b',
-            ],
-            'software_dev': [
-                r'\bsoftware\s+(?:developer|development|engineer)\b',
-                r'\b(?:senior|jr|junior)\s+developer\b',
-                r'\bpython\b',
-                r'\bjava\b',
-                r'\bjavascript\b',
-                r'\breact\b',
-                r'\bangular\b',
-                r'\bvue\.?js\b',
-                r'\bnode\.?js\b',
-                r'\bprogrammer\b',
-                r'\bcoding\b',
-                r'\bapi\b',
-                r'\bruby\b',
-                r'\bphp\b',
-                r'\blaravel\b',
-                r'\bdjango\b',
-                r'\bspring\b',
-                r'\bdocker\b',
-            ],
-            'mobile_dev': [
-                r'\bmobile\s+(?:developer|development|app)\b',
-                r'\bios\s+(?:developer|development)\b',
-                r'\bandroid\s+(?:developer|development)\b',
-                r'\bapp\s+(?:developer|development)\b',
-                r'\bswift\b',
-                r'\bkotlin\b',
-                r'\breact\s+native\b',
-                r'\bflutter\b',
-                r'\bxcode\b',
-                r'\bandroid\s+studio\b',
-            ],
-            'tech_misc': [
-                r'\bdevops\b',
-                r'\bcloud\b',
-                r'\baws\b',
-                r'\bazure\b',
-                r'\bgcp\b',
-                r'\bdatabase\b',
-                r'\bsql\b',
-                r'\bmongo\b',
-                r'\bpostgres\b',
-                r'\bdata\s+(?:scientist|science)\b',
-                r'\bml\b',
-                r'\bai\b',
-                r'\bartificial\s+intelligence\b',
-                r'\bmachine\s+learning\b',
-                r'\bdeep\s+learning\b',
-                r'\bgit\b',
-                r'\blinux\b',
-                r'\bci/cd\b',
-                r'\bkubernetes\b',
-                r'\bk8s\b',
-            ]
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the wall time of the with block under name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        """Return every series as plain JSON data; histogram buckets are cumulative."""
+        with self._lock:
+            counters = defaultdict(list)
+            for (name, labels), value in self._counters.items():
+                counters[name].append(dict(labels, value=value))
+            histograms = defaultdict(list)
+            for (name, labels), histogram in self._histograms.items():
+                cumulative, total = {}, 0
+                for bound, count in zip(self.BUCKETS, histogram['buckets']):
+                    total += count
+                    cumulative[str(bound)] = total
+                cumulative['+Inf'] = histogram['count']
+                histograms[name].append(dict(labels, count=histogram['count'], sum=histogram['sum'],
+                                             buckets=cumulative))
+        return {
+            'counters': dict(counters),
+            'histograms': dict(histograms),
+            'stage_totals': self.stage_totals(histograms.get('stage_seconds', [])),
         }
 
-        # Load the cities list (continuing from previous list)
-        self.craigslist_sites = {
-            # WEST COAST
-            ## California
-            'SF Bay Area': 'sfbay',
-            'Los Angeles': 'losangeles',
-            'San Diego': 'sandiego',
-            'Sacramento': 'sacramento',
-            'Inland Empire': 'inlandempire',
-            'Orange County': 'orangecounty',
-            'Fresno': 'fresno',
-            'Ventura County': 'ventura',
-            'Bakersfield': 'bakersfield',
-            'Long Beach': 'longbeach',
-            'Palm Springs': 'palmsprings',
-            'Monterey Bay': 'monterey',
-            'Santa Barbara': 'santabarbara',
-            'Stockton': 'stockton',
-            'Modesto': 'modesto',
-            'San Luis Obispo': 'slo',
-            'Santa Maria': 'santamaria',
-            'Redding': 'redding',
-            'Chico': 'chico',
-            'Humboldt County': 'humboldt',
-            'Merced': 'merced',
-            'Susanville': 'susanville',
-            'Visalia-Tulare': 'visalia',
-            'Yuba-Sutter': 'yubasutter',
-            'Mendocino': 'mendocino',
-
-            ## Oregon
-            'Portland': 'portland',
-            'Eugene': 'eugene',
-            'Salem': 'salem',
-            'Medford': 'medford',
-            'Bend': 'bend',
-            'Corvallis': 'corvallis',
-            'Roseburg': 'roseburg',
-            'Klamath Falls': 'klamath',
-            'Coos Bay': 'coosbay',
-
-            ## Washington
-            'Seattle': 'seattle',
-            'Tacoma': 'tacoma',
-            'Spokane': 'spokane',
-            'Olympia': 'olympia',
-            'Bellingham': 'bellingham',
-            'Kennewick': 'kpr',
-            'Yakima': 'yakima',
-            'Wenatchee': 'wenatchee',
-            'Everett': 'everett',
-            'Port Angeles': 'portangeles',
-
-            # SOUTHWEST
-            ## Arizona
-            'Phoenix': 'phoenix',
-            'Tucson': 'tucson',
-            'Flagstaff': 'flagstaff',
-            'Yuma': 'yuma',
-            'Sierra Vista': 'sierravista',
-            'Prescott': 'prescott',
-            'Mohave County': 'mohave',
-
-            ## Nevada
-            'Las Vegas': 'lasvegas',
-            'Reno': 'reno',
-            'Elko': 'elko',
-
-            ## New Mexico
-            'Albuquerque': 'albuquerque',
-            'Santa Fe': 'santafe',
-            'Las Cruces': 'lascruces',
-            'Roswell': 'roswell',
-            'Farmington': 'farmington',
-
-            # MOUNTAIN STATES
-            ## Colorado
-            'Denver': 'denver',
-            'Colorado Springs': 'cosprings',
-            'Boulder': 'boulder',
-            'Fort Collins': 'fortcollins',
-            'Pueblo': 'pueblo',
-            'Western Slope': 'westslope',
-            'High Rockies': 'rockies',
-            'Eastern CO': 'eastco',
-
-            ## Utah
-            'Salt Lake City': 'saltlakecity',
-            'Provo': 'provo',
-            'Ogden': 'ogden',
-            'St George': 'stgeorge',
-            'Logan': 'logan',
-
-            ## Idaho
-            'Boise': 'boise',
-            'Idaho Falls': 'eastidaho',
-            'Twin Falls': 'twinfalls',
-            'Lewiston': 'lewiston',
-            'Pocatello': 'pocatello',
-
-            ## Montana
-            'Billings': 'billings',
-            'Missoula': 'missoula',
-            'Great Falls': 'greatfalls',
-            'Bozeman': 'bozeman',
-            'Helena': 'helena',
-            'Butte': 'butte',
-            'Kalispell': 'kalispell',
-
-            ## Wyoming
-            'Wyoming': 'wyoming',
-
-            # MIDWEST - NORTH
-            ## Minnesota
-            'Minneapolis/St Paul': 'minneapolis',
-            'Duluth': 'duluth',
-            'Rochester': 'rmn',
-            'St Cloud': 'stcloud',
-            'Mankato': 'mankato',
-            'Bemidji': 'bemidji',
-
-            ## Wisconsin
-            'Milwaukee': 'milwaukee',
-            'Madison': 'madison',
-            'Green Bay': 'greenbay',
-            'Appleton': 'appleton',
-            'Eau Claire': 'eauclaire',
-            'La Crosse': 'lacrosse',
-            'Sheboygan': 'sheboygan',
-            'Wausau': 'wausau',
-
-            ## Michigan
-            'Detroit': 'detroit',
-            'Grand Rapids': 'grandrapids',
-            'Ann Arbor': 'annarbor',
-            'Lansing': 'lansing',
-            'Flint': 'flint',
-            'Kalamazoo': 'kalamazoo',
-            'Saginaw': 'saginaw',
-            'Upper Peninsula': 'up',
-            'Battle Creek': 'battlecreek',
-            'Monroe': 'monroemi',
-            'Muskegon': 'muskegon',
-            'Northern MI': 'nmi',
-            'Port Huron': 'porthuron',
-
-            # MIDWEST - CENTRAL
-            ## Illinois
-            'Chicago': 'chicago',
-            'Springfield': 'springfieldil',
-            'Champaign': 'chambana',
-            'Peoria': 'peoria',
-            'Rockford': 'rockford',
-            'Bloomington': 'bloomington',
-            'Carbondale': 'carbondale',
-            'Quad Cities': 'quadcities',
-            'Decatur': 'decatur',
-
-            ## Indiana
-            'Indianapolis': 'indianapolis',
-            'Fort Wayne': 'fortwayne',
-            'South Bend': 'southbend',
-            'Evansville': 'evansville',
-            'Bloomington': 'bloomington',
-            'Lafayette': 'tippecanoe',
-            'Terre Haute': 'terrehaute',
-            'Muncie': 'muncie',
-
-            ## Ohio
-            'Cleveland': 'cleveland',
-            'Columbus': 'columbus',
-            'Cincinnati': 'cincinnati',
-            'Dayton': 'dayton',
-            'Toledo': 'toledo',
-            'Akron/Canton': 'akroncanton',
-            'Youngstown': 'youngstown',
-            'Lima': 'limaohio',
-            'Mansfield': 'mansfield',
-            'Sandusky': 'sandusky',
-            'Zanesville': 'zanesville',
-
-            # MIDWEST - SOUTH
-            ## Missouri
-            'St Louis': 'stlouis',
-            'Kansas City': 'kansascity',
-            'Springfield MO': 'springfield',
-            'Columbia': 'columbiamo',
-            'Jefferson City': 'jeffersoncity',
-            'St Joseph': 'stjoseph',
-            'Joplin': 'joplin',
-
-            ## Kansas
-            'Wichita': 'wichita',
-            'Topeka': 'topeka',
-            'Lawrence': 'lawrence',
-            'Manhattan': 'ksu',
-            'Salina': 'salina',
-
-            ## Iowa
-            'Des Moines': 'desmoines',
-            'Cedar Rapids': 'cedarrapids',
-            'Iowa City': 'iowacity',
-            'Waterloo': 'waterloo',
-            'Sioux City': 'siouxcity',
-            'Quad Cities': 'quadcities',
-            'Ames': 'ames',
-            'Dubuque': 'dubuque',
-
-            ## Nebraska
-            'Omaha': 'omaha',
-            'Lincoln': 'lincoln',
-            'Grand Island': 'grandisland',
-            'North Platte': 'northplatte',
-            'Scottsbluff': 'scottsbluff',
-
-            # SOUTH CENTRAL
-            ## Texas
-            'Austin': 'austin',
-            'Dallas': 'dallas',
-            'Houston': 'houston',
-            'San Antonio': 'sanantonio',
-            'Fort Worth': 'fortworth',
-            'El Paso': 'elpaso',
-            'Corpus Christi': 'corpuschristi',
-            'McAllen': 'mcallen',
-            'Lubbock': 'lubbock',
-            'Amarillo': 'amarillo',
-            'Waco': 'waco',
-            'Beaumont': 'beaumont',
-            'Brownsville': 'brownsville',
-            'College Station': 'collegestation',
-            'Del Rio': 'delrio',
-            'Galveston': 'galveston',
-            'Killeen': 'killeen',
-            'Laredo': 'laredo',
-            'Midland': 'midland',
-            'Odessa': 'odessa',
-            'San Marcos': 'sanmarcos',
-            'Tyler': 'tyler',
-            'Victoria': 'victoria',
-            'Wichita Falls': 'wichitafalls',
-
-            ## Oklahoma
-            'Oklahoma City': 'oklahomacity',
-            'Tulsa': 'tulsa',
-            'Lawton': 'lawton',
-            'Stillwater': 'stillwater',
-
-            ## Arkansas
-            'Little Rock': 'littlerock',
-            'Fayetteville': 'fayar',
-            'Fort Smith': 'fortsmith',
-            'Jonesboro': 'jonesboro',
-            'Texarkana': 'texarkana',
-
-            # SOUTHEAST
-            ## Florida
-            'Miami': 'miami',
-            'Tampa': 'tampa',
-            'Orlando': 'orlando',
-            'Jacksonville': 'jacksonville',
-            'Fort Lauderdale': 'fortlauderdale',
-            'West Palm Beach': 'westpalm',
-            'Tallahassee': 'tallahassee',
-            'Gainesville': 'gainesville',
-            'Pensacola': 'pensacola',
-            'Daytona': 'daytona',
-            'Fort Myers': 'fortmyers',
-            'Sarasota': 'sarasota',
-            'Space Coast': 'spacecoast',
-            'Lakeland': 'lakeland',
-            'Ocala': 'ocala',
-            'Panama City': 'panamacity',
-            'St Augustine': 'staugustine',
-            'Treasure Coast': 'treasure',
-            'Keys': 'keys',
-
-            ## Georgia
-            'Atlanta': 'atlanta',
-            'Augusta': 'augusta',
-            'Savannah': 'savannah',
-            'Macon': 'macon',
-            'Athens': 'athens',
-            'Columbus': 'columbusga',
-            'Albany': 'albanyga',
-            'Brunswick': 'brunswick',
-            'Valdosta': 'valdosta',
-
-            ## North Carolina
-            'Charlotte': 'charlotte',
-            'Raleigh-Durham': 'raleigh',
-            'Greensboro': 'greensboro',
-            'Winston-Salem': 'winstonsalem',
-            'Asheville': 'asheville',
-            'Wilmington': 'wilmington',
-            'Fayetteville': 'fayetteville',
-            'Boone': 'boone',
-            'Greenville NC': 'greenville',
-            'Hickory': 'hickory',
-            'Jacksonville NC': 'onslow',
-            'Outer Banks': 'outerbanks',
-
-            ## South Carolina
-            'Charleston SC': 'charleston',
-            'Columbia': 'columbia',
-            'Greenville SC': 'greenville',
-            'Myrtle Beach': 'myrtlebeach',
-            'Hilton Head': 'hiltonhead',
-            'Florence SC': 'florencesc',
-            'Aiken': 'aiken',
-
-            ## Tennessee
-            'Nashville': 'nashville',
-            'Memphis': 'memphis',
-            'Knoxville': 'knoxville',
-            'Chattanooga': 'chattanooga',
-            'Tri-Cities': 'tricities',
-            'Clarksville': 'clarksville',
-            'Jackson TN': 'jacksontn',
-            'Cookeville': 'cookeville',
-
-            ## Alabama
-            'Birmingham': 'birmingham',
-            'Huntsville': 'huntsville',
-            'Mobile': 'mobile',
-            'Montgomery': 'montgomery',
-            'Auburn': 'auburn',
-            'Dothan': 'dothan',
-            'Florence': 'shoals',
-            'Gadsden': 'gadsden',
-            'Tuscaloosa': 'tuscaloosa',
-
-            ## Mississippi
-            'Jackson MS': 'jackson',
-            'Hattiesburg': 'hattiesburg',
-            'Biloxi': 'gulfport',
-            'Meridian': 'meridian',
-            'North MS': 'northmiss',
-            'Southwest MS': 'natchez',
-
-            ## Louisiana
-            'New Orleans': 'neworleans',
-            'Baton Rouge': 'batonrouge',
-            'Shreveport': 'shreveport',
-            'Lafayette': 'lafayette',
-            'Lake Charles': 'lakecharles',
-            'Monroe': 'monroe',
-            'Alexandria': 'cenla',
-            'Houma': 'houma',
-
-            ## Kentucky
-            'Louisville': 'louisville',
-            'Lexington': 'lexington',
-            'Bowling Green': 'bgky',
-            'Owensboro': 'owensboro',
-            'Western KY': 'westky',
-            'Eastern KY': 'eastky',
-
-            # NORTHEAST
-            ## New York
-            'New York City': 'newyork',
-            'Long Island': 'longisland',
-            'Buffalo': 'buffalo',
-            'Rochester NY': 'rochester',
-            'Syracuse': 'syracuse',
-            'Albany': 'albany',
-            'Hudson Valley': 'hudsonvalley',
-            'Binghamton': 'binghamton',
-            'Elmira': 'elmira',
-            'Finger Lakes': 'fingerlakes',
-            'Glens Falls': 'glensfalls',
-            'Ithaca': 'ithaca',
-            'Oneonta': 'oneonta',
-            'Plattsburgh': 'plattsburgh',
-            'Potsdam': 'potsdam',
-            'Utica': 'utica',
-            'Watertown': 'watertown',
-
-            ## New Jersey
-            'North Jersey': 'newjersey',
-            'South Jersey': 'southjersey',
-            'Central Jersey': 'jerseyshore',
-
-            ## Pennsylvania
-            'Philadelphia': 'philadelphia',
-            'Pittsburgh': 'pittsburgh',
-            'Allentown': 'allentown',
-            'Erie': 'erie',
-            'Harrisburg': 'harrisburg',
-            'Scranton': 'scranton',
-            'State College': 'pennstate',
-            'Lancaster': 'lancaster',
-            'Altoona': 'altoona',
-            'Chambersburg': 'chambersburg',
-            'Meadville': 'meadville',
-            'Reading': 'reading',
-            'Williamsport': 'williamsport',
-            'York': 'york',
-
-            ## Massachusetts
-            'Boston': 'boston',
-            'Worcester': 'worcester',
-            'Springfield MA': 'westernmass',
-            'South Coast': 'southcoast',
-            'Cape Cod': 'capecod',
-
-            ## Connecticut
-            'Hartford': 'hartford',
-            'New Haven': 'newhaven',
-            'Eastern CT': 'newlondon',
-            'Northwest CT': 'nwct',
-
-            ## Maine
-            'Portland ME': 'maine',
-            'Bangor': 'bangor',
-            'Augusta': 'augusta',
-
-            ## New Hampshire
-            'New Hampshire': 'nh',
-
-            ## Rhode Island
-            'Rhode Island': 'providence',
-
-            ## Vermont
-            'Vermont': 'vermont',
-            'Burlington': 'burlington',
-
-            # MID-ATLANTIC
-            ## Virginia
-            'Northern VA': 'nova',
-            'Richmond': 'richmond',
-            'Norfolk': 'norfolk',
-            'Roanoke': 'roanoke',
-            'Charlottesville': 'charlottesville',
-            'Danville': 'danville',
-            'Fredericksburg': 'fredericksburg',
-            'Harrisonburg': 'harrisonburg',
-            'Lynchburg': 'lynchburg',
-            'Winchester': 'winchester',
-
-            ## Maryland
-            'Baltimore': 'baltimore',
-            'Western Maryland': 'westmd',
-            'Eastern Shore': 'easternshore',
-            'Frederick': 'frederick',
-            'Southern Maryland': 'smd',
-
-            ## DC
-            'Washington DC': 'washingtondc',
-
-            ## Delaware
-            'Delaware': 'delaware',
-
-            ## West Virginia
-            'Charleston WV': 'charlestonwv',
-            'Huntington': 'huntington',
-            'Morgantown': 'morgantown',
-            'Northern Panhandle': 'wheeling',
-            'Parkersburg': 'parkersburg',
-            'Southern WV': 'swv',
-
-            # ALASKA & HAWAII
-            ## Alaska
-            'Anchorage': 'anchorage',
-            'Fairbanks': 'fairbanks',
-            'Juneau': 'juneau',
-            'Kenai Peninsula': 'kenai',
-
-            ## Hawaii
-            'Honolulu': 'honolulu',
-            'Big Island': 'bigisland',
-            'Maui': 'maui',
-            'Kauai': 'kauai',
-
-            # CANADA
-            'Vancouver BC': 'vancouver',
-            'Victoria BC': 'victoria',
-            'Montreal': 'montreal',
-            'Toronto': 'toronto',
-            'Calgary': 'calgary',
-            'Edmonton': 'edmonton',
-            'Ottawa': 'ottawa',
-            'Winnipeg': 'winnipeg',
-            'Halifax': 'halifax',
-            'Saskatoon': 'saskatoon',
-
-            # U.S. TERRITORIES
-            'Puerto Rico': 'puertorico',
-            'U.S. Virgin Islands': 'virgin',
-            'Guam': 'guam'
+    @classmethod
+    def from_snapshots(cls, snapshots: List[Optional[Dict]]) -> 'Metrics':
+        """Rebuild metrics from snapshot() blocks, adding up series with the same name and labels."""
+        metrics = cls()
+        for snapshot in snapshots:
+            if not snapshot:
+                continue
+            for name, series in snapshot['counters'].items():
+                for entry in series:
+                    metrics.inc(name, entry['value'], **{k: v for k, v in entry.items() if k != 'value'})
+            for name, series in snapshot['histograms'].items():
+                for entry in series:
+                    labels = tuple(sorted((k, v) for k, v in entry.items() if k not in ('count', 'sum', 'buckets')))
+                    histogram = metrics._histograms.setdefault(
+                        (name, labels), {'buckets': [0] * len(cls.BUCKETS), 'sum': 0.0, 'count': 0})
+                    previous = 0
+                    for i, bound in enumerate(cls.BUCKETS):
+                        cumulative = entry['buckets'][str(bound)]
+                        histogram['buckets'][i] += cumulative - previous
+                        previous = cumulative
+                    histogram['sum'] += entry['sum']
+                    histogram['count'] += entry['count']
+        return metrics
+
+    @staticmethod
+    def stage_totals(series: List[Dict]) -> Dict[str, Dict[str, float]]:
+        """Sum stage_seconds histograms over sites and hosts: {stage: {'count', 'seconds'}}."""
+        totals = {}
+        for entry in series:
+            total = totals.setdefault(entry['stage'], {'count': 0, 'seconds': 0.0})
+            total['count'] += entry['count']
+            total['seconds'] += entry['sum']
+        return totals
+
+    def prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        def render_labels(labels, **extra):
+            pairs = list(labels) + list(extra.items())
+            if not pairs:
+                return ''
+            escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+            return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+        snapshot = self.snapshot()
+        lines = []
+        for name, series in snapshot['counters'].items():
+            lines.append(f'# TYPE {self.PREFIX}{name} counter')
+            for entry in series:
+                labels = [(k, v) for k, v in entry.items() if k != 'value']
+                lines.append(f'{self.PREFIX}{name}{render_labels(labels)} {entry["value"]:g}')
+        for name, series in snapshot['histograms'].items():
+            lines.append(f'# TYPE {self.PREFIX}{name} histogram')
+            for entry in series:
+                labels = [(k, v) for k, v in entry.items() if k not in ('count', 'sum', 'buckets')]
+                for bound, count in entry['buckets'].items():
+                    lines.append(f'{self.PREFIX}{name}_bucket{render_labels(labels, le=bound)} {count}')
+                lines.append(f'{self.PREFIX}{name}_sum{render_labels(labels)} {entry["sum"]:.6f}')
+                lines.append(f'{self.PREFIX}{name}_count{render_labels(labels)} {entry["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+class NullMetrics:
+    """Drop-in for Metrics when instrumentation is disabled; every call is a no-op."""
+
+    enabled = False
+    _timer = nullcontext()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def time(self, name: str, **labels):
+        return self._timer
+
+    def snapshot(self) -> None:
+        return None
+
+    def prometheus(self) -> str:
+        return ''
+
+
+class ConnectionStats:
+    """Thread-safe per-run counters for HTTP requests and connection reuse."""
+
+    def __init__(self, metrics=None):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.metrics = metrics or NullMetrics()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return the counters, with reused connections derived from the totals."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': max(0, self.requests - self.new_connections),
+            }
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection they open."""
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        metrics = stats.metrics
+
+        def counting_pool(base):
+            def _new_conn(pool):
+                stats.record_connection()
+                conn = base._new_conn(pool)
+                if metrics.enabled:
+                    # DNS lookup, TCP connect and TLS handshake all happen in connect()
+                    connect = conn.connect
+
+                    def timed_connect():
+                        with metrics.time('stage_seconds', stage='connect', host=pool.host):
+                            connect()
+                    conn.connect = timed_connect
+                return conn
+            return type(f'Counting{base.__name__}', (base,), {'_new_conn': _new_conn})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': counting_pool(HTTPConnectionPool),
+            'https': counting_pool(HTTPSConnectionPool),
         }
 
-        # Initialize tracking sets and counters
-        self.seen_titles = set()
-        self.seen_links = set()
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+class HttpTransport:
+    """Shared keep-alive HTTP session used for all search and detail fetches.
+
+    Connections are pooled per host, compressed responses (gzip/deflate, plus
+    brotli/zstd when their decoders are installed) are negotiated once in the
+    session headers, and connection reuse is counted for the run summary.
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def __init__(self, pool_connections: int = 400, pool_maxsize: int = 4, timeout: float = 15, metrics=None):
+        self.timeout = timeout
+        self.stats = ConnectionStats(metrics)
+
+        self.session = requests.Session()
+        self.session.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+        self.session.headers['User-Agent'] = self.USER_AGENT
+
+        adapter = CountingHTTPAdapter(self.stats, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Issue a GET over the pooled session."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit breaker has tripped."""
+
+
+class RetryPolicy:
+    """Which failures to retry, and how long to back off between attempts."""
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, attempts: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.attempts = max(1, attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter before retry number attempt + 1."""
+        return min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """Per-host breaker that stops requests to a host after repeated failed requests.
+
+    A host trips after failure_threshold consecutive failures (each already
+    retried by the RetryPolicy) and stays open until reset().
+    """
+
+    def __init__(self, failure_threshold: int = 3):
+        self.failure_threshold = failure_threshold
+        self._lock = threading.Lock()
+        self._failures = defaultdict(int)
+        self._open = set()
+
+    def is_open(self, host: str) -> bool:
+        return host in self._open
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def record_failure(self, host: str) -> bool:
+        """Count a failure and return True if it tripped the breaker."""
+        with self._lock:
+            self._failures[host] += 1
+            if self._failures[host] >= self.failure_threshold and host not in self._open:
+                self._open.add(host)
+                return True
+            return False
+
+    def open_hosts(self) -> List[str]:
+        return sorted(self._open)
+
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._open.clear()
+
+
+class AdaptiveBucket:
+    """Token bucket whose refill rate backs off multiplicatively and recovers additively."""
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoffs = 0
+        self.wait_time = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def backoff(self, factor: float, now: float, hold: float = 0.0):
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.backoffs += 1
+        if hold > 0:
+            self.blocked_until = max(self.blocked_until, now + hold)
+
+    def recover(self, step: float):
+        self.rate = min(self.max_rate, self.rate + step)
+
+
+class AdaptiveRateLimiter:
+    """Per-host and global request rate limiting with jitter and automatic backoff.
+
+    Every request takes a token from its host's bucket and from the global
+    bucket. A 429/503 or a response slower than slow_threshold cuts the host's
+    rate by backoff_factor (throttling responses also slow the global bucket
+    and honour Retry-After); each successful response then adds recovery_step
+    back, so throughput climbs gradually towards the configured maximum.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, host_rate: float = 0.5, min_host_rate: float = 0.05, max_host_rate: float = 2.0,
+                 global_rate: float = 20.0, jitter: float = 0.1, slow_threshold: float = 5.0,
+                 backoff_factor: float = 0.5, recovery_step: float = 0.1):
+        self.host_rate = host_rate
+        self.min_host_rate = min_host_rate
+        self.max_host_rate = max(max_host_rate, host_rate)
+        self.jitter = jitter
+        self.slow_threshold = slow_threshold
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.global_bucket = AdaptiveBucket(global_rate, global_rate / 10, global_rate, burst=max(1.0, global_rate))
+        self.throttled_requests = 0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host_bucket(self, host: str) -> AdaptiveBucket:
+        bucket = self._hosts.get(host)
+        if bucket is None:
+            bucket = self._hosts[host] = AdaptiveBucket(self.host_rate, self.min_host_rate, self.max_host_rate)
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to host is allowed; returns the time spent waiting."""
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._host_bucket(host)
+            wait = max(self.global_bucket.reserve(now), bucket.reserve(now))
+            if wait > 0:
+                wait *= 1 + random.uniform(0, self.jitter)
+                bucket.wait_time += wait
+                self.total_wait += wait
+                self.throttled_requests += 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, host: str, status: Optional[int], elapsed: float, retry_after: Optional[str] = None):
+        """Adjust host and global rates from a response (status None for a failed request)."""
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._host_bucket(host)
+            if status in self.THROTTLE_STATUSES:
+                hold = float(retry_after) if retry_after and retry_after.isdigit() else 0.0
+                bucket.backoff(self.backoff_factor, now, hold)
+                self.global_bucket.backoff(1 - (1 - self.backoff_factor) / 4, now)
+            elif elapsed > self.slow_threshold:
+                bucket.backoff(self.backoff_factor, now)
+            elif status is not None and status < 400:
+                bucket.recover(self.recovery_step)
+                self.global_bucket.recover(self.recovery_step)
+
+    def stats(self) -> Dict:
+        """Return limiter state and throttling delays for tuning."""
+        with self._lock:
+            return {
+                'global_rate': round(self.global_bucket.rate, 3),
+                'global_backoffs': self.global_bucket.backoffs,
+                'throttled_requests': self.throttled_requests,
+                'total_wait': round(self.total_wait, 3),
+                'host_backoffs': sum(bucket.backoffs for bucket in self._hosts.values()),
+                'hosts': {
+                    host: {
+                        'rate': round(bucket.rate, 3),
+                        'backoffs': bucket.backoffs,
+                        'wait': round(bucket.wait_time, 3),
+                    }
+                    for host, bucket in self._hosts.items()
+                },
+            }
+
+
+class KeywordMatcher:
+    """Precompiled matcher reporting every keyword group that matches a text.
+
+    All groups are combined into one alternation with a named group per
+    keyword group, so text that matches nothing (the common case) is scanned
+    once. When something matches, the remaining groups only need checking
+    from the leftmost match onwards, since none of them can match earlier.
+    """
+
+    def __init__(self, keyword_groups: Dict[str, List[str]]):
+        self.groups = list(keyword_groups)
+        self._group_regexes = [
+            re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE) if patterns else None
+            for patterns in keyword_groups.values()
+        ]
+        alternatives = [
+            f'(?P<g{i}>{regex.pattern})'
+            for i, regex in enumerate(self._group_regexes) if regex is not None
+        ]
+        self._combined = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def match(self, text: str) -> List[str]:
+        """Return the matching keyword groups, in keyword group order."""
+        if self._combined is None:
+            return []
+
+        text = text.lower()
+        first = self._combined.search(text)
+        if not first:
+            return []
+
+        first_index = int(first.lastgroup[1:])
+        start = first.start()
+        return [
+            group for i, (group, regex) in enumerate(zip(self.groups, self._group_regexes))
+            if i == first_index or (regex is not None and regex.search(text, start))
+        ]
+
+
+class ExclusionFilter:
+    """Precompiled exclusion rules that answer in a single scan.
+
+    Each rule becomes a named group in one alternation, so a match also says
+    which rule fired. Reject counts are kept per rule, alongside the number of
+    titles checked, to measure reject rates and spot rules that never fire.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.rules = list(dict.fromkeys(patterns))  # Drop repeated rules, keep order
+        self._regex = re.compile(
+            '|'.join(f'(?P<r{i}>{pattern})' for i, pattern in enumerate(self.rules)),
+            re.IGNORECASE
+        ) if self.rules else None
+        self.checked = 0
+        self.rejects = [0] * len(self.rules)
+
+    def match(self, title: str) -> Optional[str]:
+        """Return the rule that excludes this title, or None if it passes."""
+        self.checked += 1
+        if self._regex is None:
+            return None
+
+        match = self._regex.search(title)
+        if not match:
+            return None
+
+        index = int(match.lastgroup[1:])
+        self.rejects[index] += 1
+        return self.rules[index]
+
+    def record(self, rule: Optional[str]) -> Optional[str]:
+        """Count a title that was checked elsewhere (in a parse pool process) and return its rule."""
+        self.checked += 1
+        if rule is not None:
+            self.rejects[self.rules.index(rule)] += 1
+        return rule
+
+    def stats(self) -> Dict:
+        """Return titles checked and rejects per rule, including rules that never fired."""
+        return {
+            'checked': self.checked,
+            'rejected': sum(self.rejects),
+            'rejected_by_rule': dict(zip(self.rules, self.rejects)),
+        }
+
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+SITE_CODE_RE = re.compile(r'^[a-z0-9-]+$')
+
+
+class ConfigError(ValueError):
+    """Raised when the site/keyword config file is malformed."""
+
+
+class GigFinderConfig:
+    """Sites, regions, keyword groups and exclusion rules, with the lookups built from them.
+
+    Sites are listed in groups sharing an area, state, region and country.
+    sites is the canonical crawl list: one entry per site code, in config
+    order, with display names that repeat across states (Columbus, Albany...)
+    suffixed with the state so none is dropped. site_index maps every site
+    code to its region, state and country. A code may only be listed under
+    several states when shared_sites names it, as for a market spanning a
+    state line; it is indexed by its first entry and site_states holds all
+    of its states.
+    """
+
+    def __init__(self, data: Dict, digest: str):
+        self.digest = digest
+        try:
+            self.site_groups = data['sites']
+            self.site_pairs = [(name, code) for group in self.site_groups for name, code in group['sites']]
+            self.shared_sites = set(data.get('shared_sites', []))
+            self.site_index = {}
+            self.site_states = defaultdict(list)
+            for group in self.site_groups:
+                for name, code in group['sites']:
+                    states = self.site_states[code]
+                    if states and group.get('state') not in states and code not in self.shared_sites:
+                        raise ConfigError(f"Site code {code!r} ({name!r}) is listed under both {states[0]} and "
+                                          f"{group.get('state')}; fix the code or add it to shared_sites")
+                    if group.get('state') not in states:
+                        states.append(group.get('state'))
+                    self.site_index.setdefault(code, {
+                        'region': group['region'],
+                        'state': group.get('state'),
+                        'country': group['country'],
+                    })
+            self.default_region = data['default_region']
+            self.keyword_groups = data['keyword_groups']
+            self.exclude_patterns = data['exclude_patterns']
+        except ConfigError:
+            raise
+        except (KeyError, TypeError, ValueError) as e:
+            raise ConfigError(f"Malformed config: {e!r}") from e
+        self.sites = self.canonical_sites()
+        self.region_index = {code: info['region'] for code, info in self.site_index.items()}
+        self.regions = list(dict.fromkeys(self.region_index.values()))
+        self.states = list(dict.fromkeys(info['state'] for info in self.site_index.values() if info['state']))
+
+        self.validate()
+        self.keyword_matcher = KeywordMatcher(self.keyword_groups)
+
+    def canonical_sites(self) -> Dict[str, str]:
+        """Return {display name: site code} with each code once and every display name unique."""
+        unique = {}
+        for name, code in self.site_pairs:
+            unique.setdefault(code, name)
+        name_counts = defaultdict(int)
+        for name in unique.values():
+            name_counts[name] += 1
+        return {
+            (f"{name}, {self.site_index[code]['state']}" if name_counts[name] > 1 else name): code
+            for code, name in unique.items()
+        }
+
+    def validate(self):
+        """Check every site code and compile every pattern on its own, so a bad one is named."""
+        for name, code in self.site_pairs:
+            if not SITE_CODE_RE.match(code):
+                raise ConfigError(f"Invalid site code {code!r} for {name!r}")
+        for group, patterns in [('exclude_patterns', self.exclude_patterns)] + list(self.keyword_groups.items()):
+            for pattern in patterns:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ConfigError(f"Invalid pattern {pattern!r} in {group}: {e}") from e
+
+
+_loaded_configs = {}
+
+
+def load_config(path: Optional[str] = None) -> GigFinderConfig:
+    """Load and validate a config file.
+
+    Configs are memoized per process by a hash of the file contents, so
+    every finder in a process shares one built config, matcher included.
+    """
+    path = path or DEFAULT_CONFIG_PATH
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+
+    config = _loaded_configs.get(digest)
+    if config is not None:
+        return config
+
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise ConfigError(f"Config {path} is not valid JSON: {e}") from e
+    config = GigFinderConfig(data, digest)
+    _loaded_configs[digest] = config
+    return config
+
+
+class SoupListingExtractor:
+    """Reference listing extractor built on a full BeautifulSoup tree."""
+
+    name = 'soup'
+
+    def extract(self, html: str) -> List[Dict[str, str]]:
+        """Return title/link/location/price records for every search result.
+
+        datetime is the listing's posted time when the page includes one
+        (a <time datetime=...> element), otherwise None. Text only counts
+        plain text nodes, not script, style, template, comment or CDATA
+        content.
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+
+        listings = []
+        for listing in soup.select('.cl-static-search-result'):
+            title_elem = listing.select_one('.title')
+            if not title_elem:
+                continue
+
+            link_elem = listing.select_one('a')
+            location_elem = listing.select_one('.location')
+            price_elem = listing.select_one('.price')
+            time_elem = listing.select_one('time[datetime]')
+
+            listings.append({
+                'title': self._get_text(title_elem),
+                'link': link_elem.get('href', '') if link_elem else '',
+                'location': self._get_text(location_elem) if location_elem else '',
+                'price': self._get_text(price_elem) if price_elem else 'Not specified',
+                'datetime': time_elem['datetime'] if time_elem else None,
+            })
+        return listings
+
+    @staticmethod
+    def _get_text(elem) -> str:
+        # Exact NavigableString only: skips Script, Stylesheet, TemplateString,
+        # Comment and CData strings, which lxml does not treat as text either
+        return elem.get_text(strip=True, types=(NavigableString,))
+
+
+class LxmlListingExtractor:
+    """Listing extractor using lxml's C parser and XPath queries.
+
+    Produces the same records as SoupListingExtractor: class selectors match
+    whole class tokens and text is joined from stripped text nodes, like
+    get_text(strip=True), leaving out script, style and template content.
+    """
+
+    name = 'lxml'
+
+    @staticmethod
+    def _has_class(name: str) -> str:
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError('the lxml listing extractor requires the lxml package')
+        self._results = lxml_html.etree.XPath(f"//*[{self._has_class('cl-static-search-result')}]")
+        self._title = lxml_html.etree.XPath(f".//*[{self._has_class('title')}]")
+        self._link = lxml_html.etree.XPath('.//a')
+        self._location = lxml_html.etree.XPath(f".//*[{self._has_class('location')}]")
+        self._price = lxml_html.etree.XPath(f".//*[{self._has_class('price')}]")
+        self._time = lxml_html.etree.XPath('.//time[@datetime]')
+        self._text = lxml_html.etree.XPath(
+            './/text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+
+    def _get_text(self, elem) -> str:
+        return ''.join(text.strip() for text in self._text(elem))
+
+    def extract(self, html: str) -> List[Dict[str, str]]:
+        """Return title/link/location/price/datetime records for every search result."""
+        if not html.strip():
+            return []
+        root = lxml_html.fromstring(html)
+
+        listings = []
+        for listing in self._results(root):
+            title_elems = self._title(listing)
+            if not title_elems:
+                continue
+
+            link_elems = self._link(listing)
+            location_elems = self._location(listing)
+            price_elems = self._price(listing)
+            time_elems = self._time(listing)
+
+            listings.append({
+                'title': self._get_text(title_elems[0]),
+                'link': (link_elems[0].get('href') or '') if link_elems else '',
+                'location': self._get_text(location_elems[0]) if location_elems else '',
+                'price': self._get_text(price_elems[0]) if price_elems else 'Not specified',
+                'datetime': time_elems[0].get('datetime') if time_elems else None,
+            })
+        return listings
+
+
+LISTING_EXTRACTORS = {
+    'soup': SoupListingExtractor,
+    'lxml': LxmlListingExtractor,
+}
+
+
+def make_listing_extractor(name: str = 'auto'):
+    """Create a listing extractor by name; 'auto' picks lxml when it is installed."""
+    if name == 'auto':
+        name = 'lxml' if lxml_html is not None else 'soup'
+    if name not in LISTING_EXTRACTORS:
+        raise ValueError(f"Unknown listing extractor '{name}' (choose from {', '.join(LISTING_EXTRACTORS)})")
+    return LISTING_EXTRACTORS[name]()
+
+
+# Extractor and matchers of a parse pool process, built once by init_parse_worker
+_parse_worker = {}
+
+
+def init_parse_worker(parser: str, keyword_groups: Dict[str, List[str]], exclude_patterns: List[str]):
+    """Set up a parse pool process."""
+    _parse_worker['extractor'] = make_listing_extractor(parser)
+    _parse_worker['keyword_matcher'] = KeywordMatcher(keyword_groups)
+    _parse_worker['exclusion_filter'] = ExclusionFilter(exclude_patterns)
+
+
+def parse_and_match(content: bytes, encoding: str) -> List[Dict]:
+    """Extract and classify the listings of a raw search page, in a parse pool process.
+
+    Each listing gets excluded_by, the exclusion rule it matches or None, and
+    categories, its matching keyword groups (empty when excluded). The whole
+    page is one round trip, so the IPC cost is shared by all its listings.
+    """
+    html = content.decode(encoding, errors='replace')
+    exclusion_filter = _parse_worker['exclusion_filter']
+    keyword_matcher = _parse_worker['keyword_matcher']
+    listings = _parse_worker['extractor'].extract(html)
+    for listing in listings:
+        listing['excluded_by'] = exclusion_filter.match(listing['title'])
+        listing['categories'] = [] if listing['excluded_by'] else keyword_matcher.match(listing['title'])
+    return listings
+
+
+def parse_posting_date(html: str) -> Optional[Dict[str, str]]:
+    """Extract the "Posted" date info from a full posting page."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Look for the specific date element
+    date_p = soup.find('p', class_='postinginfo reveal')
+    if date_p and 'Posted' in date_p.text:
+        time_elem = date_p.find('time', class_='date timeago')
+        if time_elem and time_elem.get('datetime'):
+            return {
+                'datetime': time_elem['datetime'],
+                'title': time_elem.get('title', ''),
+                'relative': time_elem.text.strip()
+            }
+    return None
+
+
+class PostingInfoParser(HTMLParser):
+    """Incremental parser for just the first <p class="postinginfo reveal"> block.
+
+    It is fed from the start of that block and sets done once the block
+    closes, with the same result parse_posting_date would give.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.result = None
+        self._in_block = False
+        self._in_time = False
+        self._text = []
+        self._time = None
+        self._time_text = []
+
+    @staticmethod
+    def _has_classes(attrs, value: str) -> bool:
+        return ' '.join((dict(attrs).get('class') or '').split()) == value
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if not self._in_block:
+            self._in_block = tag == 'p' and self._has_classes(attrs, 'postinginfo reveal')
+        elif tag == 'time' and self._time is None and self._has_classes(attrs, 'date timeago'):
+            self._time = dict(attrs)
+            self._in_time = True
+
+    def handle_endtag(self, tag):
+        if self.done or not self._in_block:
+            return
+        if tag == 'time':
+            self._in_time = False
+        elif tag == 'p':
+            self.finish()
+
+    def handle_data(self, data):
+        if self.done or not self._in_block:
+            return
+        self._text.append(data)
+        if self._in_time:
+            self._time_text.append(data)
+
+    def finish(self):
+        """Settle the result from whatever part of the block has been seen."""
+        if self.done:
+            return
+        self.done = True
+        if 'Posted' in ''.join(self._text) and self._time and self._time.get('datetime'):
+            self.result = {
+                'datetime': self._time['datetime'],
+                'title': self._time.get('title') or '',
+                'relative': ''.join(self._time_text).strip()
+            }
+
+
+class PostingDateExtractor:
+    """Extract posting dates from a streamed detail page response.
+
+    The body is decoded chunk by chunk and skipped without parsing until the
+    postinginfo block appears; only that block is parsed, and reading stops
+    once it closes. If the block is not found within max_bytes, or the page
+    ends first, the whole page goes through parse_posting_date instead and
+    the fallback is counted so layout changes show up in the run stats.
+    """
+
+    BLOCK_RE = re.compile(r'<p\s[^>]*class\s*=\s*["\']?\s*postinginfo\s+reveal\s*["\'\s>]', re.IGNORECASE)
+    CHUNK_SIZE = 16384
+    DRAIN_LIMIT = 65536
+
+    def __init__(self, max_bytes: int = 1 << 20):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.fast = 0
+        self.fallbacks = 0
+        self.bytes_read = 0
+
+    def extract(self, response: requests.Response) -> Optional[Dict[str, str]]:
+        """Return date info from a response opened with stream=True."""
+        encoding = response.encoding or 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        parser = None
+        pending = ''
+        chunks = []
+        read = 0
+        stream = response.iter_content(chunk_size=self.CHUNK_SIZE)
+
+        for chunk in stream:
+            chunks.append(chunk)
+            read += len(chunk)
+            text = decoder.decode(chunk)
+
+            if parser is None:
+                pending += text
+                match = self.BLOCK_RE.search(pending)
+                if match:
+                    parser = PostingInfoParser()
+                    parser.feed(pending[match.start():])
+                else:
+                    pending = pending[-512:]  # Keep enough to catch a tag split across chunks
+            else:
+                parser.feed(text)
+
+            if parser is not None and parser.done:
+                break
+            if read >= self.max_bytes:
+                break
+
+        if parser is not None:
+            if not parser.done and read < self.max_bytes:
+                parser.finish()  # Page ended inside the block
+            if parser.done:
+                self._drain(response, stream)
+                self._record(read, fallback=False)
+                return parser.result
+
+        # Layout not recognized within the bound: parse the whole page instead
+        for chunk in stream:
+            chunks.append(chunk)
+            read += len(chunk)
+        self._record(read, fallback=True)
+        return parse_posting_date(b''.join(chunks).decode(encoding, errors='replace'))
+
+    def _drain(self, response: requests.Response, stream):
+        """Read a short remainder so the connection can go back to the pool."""
+        try:
+            remaining = int(response.headers.get('Content-Length', '')) - response.raw.tell()
+        except ValueError:
+            return
+        if 0 < remaining <= self.DRAIN_LIMIT:
+            for _ in stream:
+                pass
+
+    def _record(self, read: int, fallback: bool):
+        with self._lock:
+            self.bytes_read += read
+            if fallback:
+                self.fallbacks += 1
+            else:
+                self.fast += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {'fast': self.fast, 'fallbacks': self.fallbacks, 'bytes_read': self.bytes_read}
+
+
+class DetailEnricher:
+    """Pipeline stage that fills in posting dates from detail pages.
+
+    Discovered results are queued and enriched in place by a bounded pool of
+    worker threads, so listing discovery never waits on detail fetches. The
+    queue only blocks submitters once queue_size results are backlogged.
+    on_done, if given, is called with each result once its lookup finishes.
+    """
+
+    def __init__(self, fetch: Callable[[str, str], Optional[Dict[str, str]]],
+                 workers: int = 4, queue_size: int = 1000,
+                 on_done: Optional[Callable[[Dict], None]] = None):
+        self.fetch = fetch
+        self.on_done = on_done
+        self.submitted = 0
+        self.enriched = 0
+        self._skip_fetch = False
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = [
+            threading.Thread(target=self._work, name=f'detail-{i}', daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, result: Dict, site_code: str):
+        """Queue a result for date enrichment."""
+        self.submitted += 1
+        self._queue.put((result, site_code))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            result, site_code = item
+            try:
+                date_info = None if self._skip_fetch else self.fetch(result['link'], site_code)
+                if date_info:
+                    result['date'] = date_block(date_info)
+                    with self._lock:
+                        self.enriched += 1
+            finally:
+                try:
+                    if self.on_done is not None:
+                        self.on_done(result)
+                finally:
+                    self._queue.task_done()
+
+    def close(self, wait: bool = True):
+        """Wait for every queued result to be enriched, then stop the workers.
+
+        With wait=False, results still queued are passed to on_done without
+        their posting pages being fetched, so shutting down after an interrupt
+        only waits for the fetches already in flight.
+        """
+        if not wait:
+            self._skip_fetch = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        return {'submitted': self.submitted, 'enriched': self.enriched}
+
+
+def date_block(date_info: Optional[Dict[str, str]], listed_at: Optional[str] = None) -> Dict:
+    """Build a result's date block from extracted posting date info.
+
+    Without date info, the search page's listing time (if any) is used.
+    timestamp is the datetime as epoch seconds, so results can be sorted and
+    filtered without parsing strings again.
+    """
+    value = date_info['datetime'] if date_info else listed_at
+    return {
+        'datetime': value,
+        'formatted': date_info['title'] if date_info else None,
+        'relative': date_info['relative'] if date_info else None,
+        'timestamp': parse_timestamp(value) if value else None,
+    }
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """Convert an ISO-style date string ("2024-03-01 10:00", "2024-03-01T10:00:00-0800") to epoch seconds.
+
+    Times without a UTC offset are taken as local time. Returns None for
+    strings that are not dates.
+    """
+    value = value.strip()
+    # fromisoformat before Python 3.11 does not accept "-0800" offsets
+    if re.search(r'[+-]\d{4}$', value):
+        value = f'{value[:-2]}:{value[-2:]}'
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_since(value: str) -> float:
+    """Parse a --since date ("2024-03-01" or "2024-03-01 18:00", local time) into epoch seconds."""
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        raise ValueError(f"Invalid date {value!r}, expected YYYY-MM-DD or 'YYYY-MM-DD HH:MM'")
+    return timestamp
+
+
+POSTING_ID_RE = re.compile(r'/(\d+)\.html')
+
+
+def posting_id(link: str) -> Optional[int]:
+    """Extract the numeric Craigslist posting ID from a posting link."""
+    match = POSTING_ID_RE.search(link)
+    return int(match.group(1)) if match else None
+
+
+class DetailCache:
+    """On-disk SQLite cache of posting date info keyed by posting ID.
+
+    A posting's "Posted" date never changes, so entries are only dropped once
+    they are older than the TTL, by which time the posting has expired.
+    Posting IDs increase over time, so the cached dates also bound when an
+    uncached posting can have been posted (see posted_no_later_than).
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 86400):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS posting_details ('
+            'posting_id INTEGER PRIMARY KEY, datetime TEXT, title TEXT, relative TEXT, cached_at REAL NOT NULL, '
+            'posted_at REAL)'
+        )
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(posting_details)')}
+        if 'posted_at' not in columns:
+            # Caches written before posted_at existed: add it and fill it in once
+            self._conn.execute('ALTER TABLE posting_details ADD COLUMN posted_at REAL')
+            rows = self._conn.execute(
+                'SELECT posting_id, datetime FROM posting_details WHERE datetime IS NOT NULL').fetchall()
+            self._conn.executemany('UPDATE posting_details SET posted_at = ? WHERE posting_id = ?',
+                                   [(parse_timestamp(value), pid) for pid, value in rows])
+        self._conn.commit()
+        self.evicted = self.evict_expired()
+
+    def get(self, posting_id: int) -> Optional[Dict[str, str]]:
+        """Return cached date info for a posting, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT datetime, title, relative FROM posting_details WHERE posting_id = ? AND cached_at >= ?',
+                (posting_id, time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {'datetime': row[0], 'title': row[1], 'relative': row[2]}
+
+    def put(self, posting_id: int, date_info: Dict[str, str]):
+        """Store date info for a posting."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO posting_details '
+                '(posting_id, datetime, title, relative, cached_at, posted_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (posting_id, date_info['datetime'], date_info['title'], date_info['relative'], time.time(),
+                 parse_timestamp(date_info['datetime']) if date_info['datetime'] else None)
+            )
+            self._conn.commit()
+
+    def posted_no_later_than(self, posting_id: int) -> Optional[float]:
+        """Return an upper bound on when a posting was posted, from cached postings.
+
+        This is the posted time of the cached posting with the smallest ID at or
+        above posting_id, since an older ID cannot have been posted later.
+        None when no such posting is cached.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT posted_at FROM posting_details WHERE posting_id >= ? AND posted_at IS NOT NULL '
+                'AND cached_at >= ? ORDER BY posting_id LIMIT 1',
+                (posting_id, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def evict_expired(self) -> int:
+        """Delete entries older than the TTL and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM posting_details WHERE cached_at < ?', (time.time() - self.ttl,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evicted': self.evicted}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RotatingBloomFilter:
+    """Fixed-memory, set-like membership filter with age-based eviction.
+
+    Keys go into the newest of `generations` Bloom filters, each sized for
+    `capacity` keys at `error_rate` false positives. When the newest
+    generation is full or older than max_age / generations seconds, the
+    oldest generation is dropped, so keys are forgotten after roughly max_age.
+    Memory stays at generations * bytes_per_generation however long the
+    process runs. A lookup checks every generation, so the false positive rate
+    (a new key reported as seen) is at most generations * error_rate.
+    Supports `in` and add(), like the sets it replaces.
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 1e-6,
+                 max_age: float = 7 * 86400, generations: int = 2):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_age = max_age
+        self.generations = max(1, generations)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._filters = [bytearray((self.num_bits + 7) // 8)]
+        self._count = 0
+        self._started = time.monotonic()
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _maybe_rotate(self):
+        if self._count >= self.capacity or time.monotonic() - self._started >= self.max_age / self.generations:
+            self._filters.insert(0, bytearray((self.num_bits + 7) // 8))
+            del self._filters[self.generations:]
+            self._count = 0
+            self._started = time.monotonic()
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return any(
+            all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+            for bits in self._filters
+        )
+
+    def add(self, key: str):
+        self._maybe_rotate()
+        bits = self._filters[0]
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    @property
+    def memory_bytes(self) -> int:
+        """Upper bound on filter memory once every generation is allocated."""
+        return self.generations * ((self.num_bits + 7) // 8)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index for finding near-duplicate postings in sub-linear time.
+
+    Texts are compared as sets of character 3-grams. Each text gets a MinHash
+    signature split into LSH bands, and only postings sharing a whole band
+    are candidates; candidates are then checked against the exact Jaccard
+    similarity of their stored titles. Bands are sized so a pair at the
+    threshold becomes a candidate at least 90% of the time. The band index
+    lives in SQLite, in memory for one run or on disk to cover historical
+    postings.
+    """
+
+    NUM_PERM = 64
+    PRIME = (1 << 61) - 1
+    SHINGLE_SIZE = 3
+
+    def __init__(self, path: str = ':memory:', threshold: float = 0.75, retention: float = 60 * 86400):
+        self.threshold = threshold
+        self.rows, self.bands = self._band_layout(threshold)
+
+        rng = random.Random(0x5EED)  # Fixed permutations keep stored bands comparable across runs
+        self._perms = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME)) for _ in range(self.NUM_PERM)]
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS postings (id INTEGER PRIMARY KEY, link TEXT, title TEXT, seen_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS bands (key INTEGER NOT NULL, id INTEGER NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS bands_key ON bands (key)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS postings_link ON postings (link)')
+        cutoff = time.time() - retention
+        self._conn.execute('DELETE FROM bands WHERE id IN (SELECT id FROM postings WHERE seen_at < ?)', (cutoff,))
+        self._conn.execute('DELETE FROM postings WHERE seen_at < ?', (cutoff,))
+        self._conn.commit()
+
+    @classmethod
+    def _band_layout(cls, threshold: float):
+        """Pick the most selective (rows, bands) that still finds 90% of pairs at the threshold."""
+        for rows in range(cls.NUM_PERM, 0, -1):
+            bands = cls.NUM_PERM // rows
+            if 1 - (1 - threshold ** rows) ** bands >= 0.9:
+                return rows, bands
+        return 1, cls.NUM_PERM
+
+    @classmethod
+    def shingles(cls, text: str) -> set:
+        text = ' '.join(re.findall(r'\w+', text.lower()))
+        size = cls.SHINGLE_SIZE
+        return {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+
+    def _band_keys(self, shingles: set) -> List[int]:
+        values = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+                  for s in shingles]
+        signature = [min((a * x + b) % self.PRIME for x in values) for a, b in self._perms]
+        return [
+            hash64(f'{self.rows}x{self.bands}:{i}:' + ','.join(map(str, signature[i * self.rows:(i + 1) * self.rows])))
+            for i in range(self.bands)
+        ]
+
+    def find(self, text: str, link: Optional[str] = None) -> Tuple[Optional[Dict], List[int]]:
+        """Return the most similar indexed posting at or above the threshold, and text's band keys.
+
+        The match is None when nothing is similar enough; the band keys are
+        returned either way so add() can reuse them. The posting at link itself
+        (same link or posting ID), indexed by an earlier run, is never its own
+        near-duplicate; exact repeats are left to is_duplicate and the seen store.
+        """
+        own_id = posting_id(link) if link else None
+        shingles = self.shingles(text)
+        keys = self._band_keys(shingles)
+        rows = self._conn.execute(
+            f'SELECT DISTINCT p.link, p.title FROM bands b JOIN postings p ON p.id = b.id '
+            f'WHERE b.key IN ({",".join("?" * len(keys))})',
+            keys
+        ).fetchall()
+
+        best = None
+        for other_link, title in rows:
+            if link is not None and (other_link == link or (own_id is not None and posting_id(other_link) == own_id)):
+                continue
+            other = self.shingles(title)
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= self.threshold and (best is None or similarity > best['similarity']):
+                best = {'link': other_link, 'title': title, 'similarity': round(similarity, 3)}
+        return best, keys
+
+    def add(self, link: str, title: str, keys: Optional[List[int]] = None):
+        """Index a posting; keys may be passed from a preceding find().
+
+        A posting already indexed under the same link only has its retention
+        renewed.
+        """
+        if self._conn.execute('UPDATE postings SET seen_at = ? WHERE link = ?', (time.time(), link)).rowcount:
+            return
+        if keys is None:
+            keys = self._band_keys(self.shingles(title))
+        cursor = self._conn.execute('INSERT INTO postings (link, title, seen_at) VALUES (?, ?, ?)',
+                                    (link, title, time.time()))
+        self._conn.executemany('INSERT INTO bands VALUES (?, ?)', [(key, cursor.lastrowid) for key in keys])
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class CrawlScheduler:
+    """Priority queue of (site, section) poll tasks with adaptive intervals.
+
+    Each task's rate of new postings is tracked as an exponentially weighted
+    average, and its next poll is set so that about target_new postings will
+    have appeared, clamped to [min_interval, max_interval]. Busy markets are
+    polled often and quiet ones rarely. New tasks start due immediately.
+    """
+
+    def __init__(self, tasks: List[tuple], min_interval: float = 300, max_interval: float = 6 * 3600,
+                 target_new: float = 3.0, smoothing: float = 0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.smoothing = smoothing
+        self.rates = {}
+        self.last_polled = {}
+        self.last_posting_id = {}
+        self._heap = []
+        now = time.monotonic()
+        for seq, task in enumerate(tasks):
+            heapq.heappush(self._heap, (now, seq, task))
+        self._seq = len(tasks)
+
+    def pop(self):
+        """Return (due_time, task) for the task that is due next."""
+        due, _, task = heapq.heappop(self._heap)
+        return due, task
+
+    def interval(self, task: tuple) -> float:
+        rate = self.rates.get(task)
+        if not rate:
+            return self.max_interval if rate == 0 else self.min_interval
+        return min(self.max_interval, max(self.min_interval, self.target_new / rate))
+
+    def record(self, task: tuple, listings: Optional[List[Dict]]) -> float:
+        """Update the task's posting rate from a poll and reschedule it; returns the new interval."""
+        now = time.monotonic()
+        if listings is not None:
+            # Posting IDs increase over time, so IDs above the last maximum are new
+            ids = [pid for pid in (posting_id(listing['link']) for listing in listings) if pid is not None]
+            last_id = self.last_posting_id.get(task)
+            if ids:
+                self.last_posting_id[task] = max(ids + [last_id or 0])
+
+            if task in self.last_polled:
+                # A section that was empty so far has no last ID: all its postings are new
+                new = sum(1 for pid in ids if pid > (last_id or 0))
+                observed = new / max(1.0, now - self.last_polled[task])
+                previous = self.rates.get(task)
+                self.rates[task] = observed if previous is None else (
+                    self.smoothing * observed + (1 - self.smoothing) * previous)
+            self.last_polled[task] = now
+
+        interval = self.interval(task)
+        heapq.heappush(self._heap, (now + interval, self._seq, task))
+        self._seq += 1
+        return interval
+
+
+class JsonlResultWriter:
+    """Append-only JSONL writer that persists each result as soon as it is final.
+
+    Every line is flushed on write, so an interrupted run keeps everything
+    found so far. A closing manifest line summarizes the completed run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, result: Dict):
+        line = json.dumps(result) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self, manifest: Optional[Dict] = None):
+        """Write the manifest record, if any, and close the file."""
+        with self._lock:
+            if manifest is not None:
+                self._file.write(json.dumps({'manifest': manifest}) + '\n')
+            self._file.close()
+
+
+def load_result_stream(path: str) -> Dict:
+    """Rebuild the run_search result structure from a streamed JSONL results file.
+
+    Each result is held once; the per-region view shares the same dicts as
+    all_results. Lines cut short by an interrupted run are skipped.
+    """
+    manifest = {}
+    all_results = []
+    region_results = defaultdict(list)
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'manifest' in record:
+                manifest = record['manifest']
+                continue
+            region_results[record.pop('region', 'Unknown')].append(record)
+            all_results.append(record)
+
+    all_results.sort(key=lambda x: len(x['categories']), reverse=True)
+    return dict(
+        manifest,
+        total_results=len(all_results),
+        results_by_region=dict(region_results),
+        all_results=all_results,
+    )
+
+
+def hash64(text: str) -> int:
+    """Stable signed 64-bit hash of a string, suitable for SQLite INTEGER keys."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+
+def shard_of(site_code: str, shard_count: int) -> int:
+    """Stable 1-based shard number for a site code, the same on every machine and run."""
+    digest = hashlib.blake2b(site_code.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % shard_count + 1
+
+
+def parse_shard(spec: str) -> tuple:
+    """Parse a K/N shard spec into (K, N), with 1 <= K <= N."""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}, expected K/N such as 3/8")
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {spec!r}, K must be between 1 and N")
+    return index, count
+
+
+def load_results(path: str) -> Dict:
+    """Load a results file written by run_search, either JSON or streamed JSONL."""
+    if path.endswith('.jsonl'):
+        return load_result_stream(path)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def sum_stats(blocks: List[Optional[Dict]]) -> Optional[Dict]:
+    """Combine stats dicts from several runs: numbers are added and lists concatenated."""
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        return None
+    combined = {}
+    for block in blocks:
+        for key, value in block.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                combined[key] = combined.get(key, 0) + value
+            elif isinstance(value, list):
+                combined[key] = combined.get(key, []) + value
+            elif isinstance(value, dict):
+                combined[key] = sum_stats([combined.get(key), value])
+            else:
+                combined.setdefault(key, value)
+    return combined
+
+
+class SeenStore:
+    """Persistent record of postings emitted by earlier runs.
+
+    Posting IDs and normalized titles are stored as 64-bit hashes in a single
+    SQLite table, so the store stays compact however many postings it covers.
+    It also keeps a mark per search section: every posting in the section
+    with an ID at or below it has been processed. This tells paginated
+    searches where earlier runs left off. New keys and marks are buffered
+    during a run and written by commit().
+    """
+
+    def __init__(self, path: str, retention: float = 60 * 86400):
+        self.path = path
+        self.retention = retention
+        self._pending = {}
+        self._pending_marks = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY, seen_at REAL NOT NULL)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS section_marks (site TEXT NOT NULL, section TEXT NOT NULL, '
+            'max_id INTEGER NOT NULL, PRIMARY KEY (site, section))'
+        )
+        self._conn.execute('DELETE FROM seen WHERE seen_at < ?', (time.time() - self.retention,))
+        self._conn.commit()
+        self._marks = {(site, section): max_id for site, section, max_id
+                       in self._conn.execute('SELECT site, section, max_id FROM section_marks')}
+
+    @staticmethod
+    def keys_for(link: str, normalized_title: str) -> List[int]:
+        """Return the store keys identifying a posting."""
+        keys = [hash64(f'title:{normalized_title}')]
+        pid = posting_id(link)
+        if pid is not None:
+            keys.append(hash64(f'id:{pid}'))
+        return keys
+
+    def contains(self, keys: List[int]) -> bool:
+        """Check whether any of the keys was recorded by an earlier run."""
+        placeholders = ','.join('?' * len(keys))
+        with self._lock:
+            row = self._conn.execute(f'SELECT 1 FROM seen WHERE key IN ({placeholders}) LIMIT 1', keys).fetchone()
+        return row is not None
+
+    def is_known(self, site_code: str, section: str, link: str) -> bool:
+        """Check whether a listing is one an earlier run already got to in this section.
+
+        True when its posting ID is at or below the section's mark.
+        """
+        pid = posting_id(link)
+        mark = self._marks.get((site_code, section))
+        return pid is not None and mark is not None and pid <= mark
+
+    def add(self, keys: List[int]):
+        """Buffer keys to be recorded on the next commit."""
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                self._pending[key] = now
+
+    def mark_section(self, site_code: str, section: str, links: List[str], complete: bool = True):
+        """Buffer a processed section's highest posting ID as its new mark.
+
+        complete says whether the listings read reach down to the current
+        mark, the end of the results or the age cutoff. If they do not (paging
+        hit max_pages first), the mark stays put, so postings between it and
+        the oldest listing read are never taken as known without having been
+        read. A section's first mark is set from whatever its first crawl read.
+        """
+        ids = [pid for pid in map(posting_id, links) if pid is not None]
+        if not ids:
+            return
+        key = (site_code, section)
+        with self._lock:
+            if not complete and (key in self._marks or key in self._pending_marks):
+                return
+            self._pending_marks[key] = max(ids + [self._pending_marks.get(key, 0)])
+
+    def commit(self):
+        """Write buffered keys and section marks to disk."""
+        with self._lock:
+            if self._pending:
+                self._conn.executemany('INSERT OR REPLACE INTO seen VALUES (?, ?)', self._pending.items())
+                self._pending.clear()
+            if self._pending_marks:
+                self._conn.executemany(
+                    'INSERT INTO section_marks VALUES (?, ?, ?) ON CONFLICT (site, section) '
+                    'DO UPDATE SET max_id = max(max_id, excluded.max_id)',
+                    [(site, section, max_id) for (site, section), max_id in self._pending_marks.items()]
+                )
+                for key, max_id in self._pending_marks.items():
+                    self._marks[key] = max(self._marks.get(key, 0), max_id)
+                self._pending_marks.clear()
+            self._conn.commit()
+
+    def close(self):
+        self.commit()
+        self._conn.close()
+
+
+class YieldStore:
+    """Per (site, section) history of search results, used to crawl productive markets first.
+
+    Listing and result counts are kept as exponentially weighted averages
+    per run, so a market's recent yield matters more than its distant past.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.3):
+        self.path = path
+        self.smoothing = smoothing
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS task_yield (site TEXT NOT NULL, section TEXT NOT NULL, '
+            'runs INTEGER NOT NULL, listings REAL NOT NULL, results REAL NOT NULL, updated REAL NOT NULL, '
+            'PRIMARY KEY (site, section))'
+        )
+        self._conn.commit()
+
+    def yields(self) -> Dict[tuple, float]:
+        """Return {(site_code, section): average results per run}."""
+        return {(site, section): results
+                for site, section, results in self._conn.execute('SELECT site, section, results FROM task_yield')}
+
+    def record(self, site_code: str, section: str, listings: int, results: int):
+        """Fold one crawl of a search section into its averages."""
+        a = self.smoothing
+        self._conn.execute(
+            'INSERT INTO task_yield VALUES (?, ?, 1, ?, ?, ?) ON CONFLICT (site, section) DO UPDATE SET '
+            'runs = runs + 1, listings = ? * excluded.listings + ? * listings, '
+            'results = ? * excluded.results + ? * results, updated = excluded.updated',
+            (site_code, section, listings, results, time.time(), a, 1 - a, a, 1 - a),
+        )
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class CraigslistGigFinder:
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 1, request_delay: float = 2.0,
+                 max_host_rate: float = 2.0, global_rate: float = 20.0,
+                 retries: int = 2, failure_threshold: int = 3,
+                 pool_connections: int = 400, pool_maxsize: int = 4,
+                 enrich: bool = True, detail_workers: int = 4, detail_queue_size: int = 1000,
+                 cache_path: Optional[str] = 'default', cache_ttl: float = 30 * 86400,
+                 incremental: bool = False, seen_store_path: Optional[str] = None,
+                 stream_results: bool = False, parser: str = 'auto',
+                 near_dup_threshold: Optional[float] = None, near_dup_path: Optional[str] = None,
+                 dedup_capacity: Optional[int] = None, dedup_max_age: float = 7 * 86400,
+                 shard: Optional[tuple] = None, base_url: str = 'https://{site}.craigslist.org',
+                 metrics: bool = False, config_path: Optional[str] = None,
+                 max_requests: Optional[int] = None, time_budget: Optional[float] = None,
+                 yield_store_path: Optional[str] = 'default',
+                 max_pages: int = 1, max_age: Optional[float] = None, since: Optional[float] = None,
+                 processes: int = 0, page_size: Optional[int] = None):
+        # Set up logging
+        self.setup_logging()
+
+        # Site root URL template, e.g. 'http://127.0.0.1:8000/{site}' for a local
+        # stand-in server; posting links come from the search pages themselves
+        self.base_url = base_url
+
+        # Search result page parser backend
+        self.parser = parser
+        self.listing_extractor = make_listing_extractor(parser)
+
+        # Optional process pool that parses search pages and matches their
+        # listings, so that CPU work is not held to one core by the GIL;
+        # started on first use
+        self.processes = processes
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+
+        # Crawl engine settings: global concurrency cap and per-site cap
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+
+        # Adaptive rate limits, starting at one request per request_delay
+        # seconds per site and adjusting to how Craigslist responds
+        self.rate_limiter = AdaptiveRateLimiter(
+            host_rate=1 / request_delay if request_delay > 0 else max_host_rate,
+            max_host_rate=max_host_rate,
+            global_rate=global_rate,
+        )
+        self.sections = ['cpg', 'crg', 'ggg']  # computer gigs, creative gigs, general gigs
+
+        # Detail-page enrichment: skipped entirely for discovery-only sweeps,
+        # otherwise run as a background stage during run_search
+        self.enrich = enrich
+        self.detail_workers = detail_workers
+        self.detail_queue_size = detail_queue_size
+        self.enricher = None
+
+        # Sites, regions, keyword groups and exclusion rules come from the
+        # JSON config; the validated, compiled form is cached by config hash
+        self.config = load_config(config_path)
+        self.keyword_groups = self.config.keyword_groups
+        self.keyword_matcher = self.config.keyword_matcher
+        self.exclude_patterns = self.config.exclude_patterns
+        self.exclusion_filter = ExclusionFilter(self.exclude_patterns)
+        self.craigslist_sites = self.config.sites
+
+        # Initialize tracking sets and counters. Long-running processes can
+        # swap the exact sets for fixed-memory filters that forget old keys.
+        if dedup_capacity:
+            self.seen_titles = RotatingBloomFilter(dedup_capacity, max_age=dedup_max_age)
+            self.seen_links = RotatingBloomFilter(dedup_capacity, max_age=dedup_max_age)
+        else:
+            self.seen_titles = set()
+            self.seen_links = set()
         self.duplicate_count = 0
 
+        # Per-stage latency histograms and counters; a no-op unless enabled
+        self.metrics = Metrics() if metrics else NullMetrics()
+        self.metrics_server = None
+
+        # Shared keep-alive transport for search and detail requests
+        self.transport = HttpTransport(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                       metrics=self.metrics)
+
+        # Retries for transient errors and a breaker for hosts that keep failing
+        self.retry_policy = RetryPolicy(attempts=retries + 1)
+        self.circuit_breaker = CircuitBreaker(failure_threshold)
+        self.request_counts = defaultdict(int)
+        self._request_counts_lock = threading.Lock()
+
+        # Per-host concurrency slots
+        self._host_lock = threading.Lock()
+        self._host_slots = {}
+
+        # Detail pages are streamed and only the posting info block is parsed
+        self.date_extractor = PostingDateExtractor()
+
+        # Streaming output appends results to a JSONL file as they are produced
+        self.stream_results = stream_results
+        self.result_writer = None
+
         # Create results directory
         self.results_dir = 'gig_finder_results'
         os.makedirs(self.results_dir, exist_ok=True)
 
+        # Search result pages read per section. Postings older than max_age
+        # seconds, or posted before the since epoch time, are stale: paging
+        # stops at them and they are dropped before any posting page request
+        self.max_pages = max_pages
+        # Listings on a full search result page; a shorter page is the last one.
+        # Learned from the first page that turns out to be followed by another
+        # when not given, so later single-page sections cost one request
+        self.page_size = page_size
+        self.max_age = max_age
+        self.since = since
+        self.cutoff_time = self.age_cutoff()
+        self.stale_count = 0
+
+        # Crawl budget; when one is set, plan_tasks puts the site sections with
+        # the best history of results first
+        self.max_requests = max_requests
+        self.time_budget = time_budget
+        if yield_store_path == 'default':
+            yield_store_path = os.path.join(self.results_dir, 'crawl_yield.sqlite')
+        self.yield_store = YieldStore(yield_store_path) if yield_store_path else None
+
+        # Optional (K, N) shard: only crawl the sites whose code hashes to
+        # shard K of N; merge_shards combines the shard outputs afterwards
+        self.shard = shard
+
+        # Persistent posting date cache, so repeat runs only fetch new postings
+        if cache_path == 'default':
+            cache_path = os.path.join(self.results_dir, 'posting_cache.sqlite')
+        self.detail_cache = DetailCache(cache_path, cache_ttl) if cache_path else None
+
+        # Incremental mode only emits postings not seen by previous runs
+        self.previously_seen_count = 0
+        self.seen_store = None
+        self._partial_sections = set()  # Sections whose last read stopped short of their mark
+        self._partial_lock = threading.Lock()
+        if incremental:
+            self.seen_store = SeenStore(seen_store_path or os.path.join(self.results_dir, 'seen_postings.sqlite'))
+
+        # Optional near-duplicate detection across regions (and, with a store
+        # path, across runs); each skipped posting records what it duplicates
+        self.near_duplicates = []
+        self.near_dup_index = None
+        if near_dup_threshold is not None:
+            self.near_dup_index = NearDuplicateIndex(near_dup_path or ':memory:', near_dup_threshold)
+
+    def serve_metrics(self, port: int, address: str = '127.0.0.1'):
+        """Serve the live metrics in the Prometheus text format at /metrics on a background thread."""
+        metrics = self.metrics
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.metrics_server = ThreadingHTTPServer((address, port), MetricsHandler)
+        self.metrics_server.daemon_threads = True
+        threading.Thread(target=self.metrics_server.serve_forever, daemon=True).start()
+        self.logger.info(f"Serving metrics on http://{address}:{port}/metrics")
+
+    def close(self):
+        """Release the HTTP transport and on-disk stores."""
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        self.transport.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        if self.detail_cache:
+            self.detail_cache.close()
+        if self.seen_store:
+            self.seen_store.close()
+        if self.near_dup_index:
+            self.near_dup_index.close()
+        if self.yield_store:
+            self.yield_store.close()
+
     def setup_logging(self):
         """Set up logging configuration."""
         logging.basicConfig(
@@ -625,211 +1860,735 @@ class CraigslistGigFinder:
 
     def matches_tech_keywords(self, text: str) -> List[str]:
         """Check if text matches any of our technical keywords."""
-        text = text.lower()
-        matches = []
-        for group, patterns in self.keyword_groups.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    matches.append(group)
-                    break
-        return matches
+        return self.keyword_matcher.match(text)
 
     def should_exclude(self, title: str) -> bool:
         """Check if the posting should be excluded based on common false positives."""
-        exclude_patterns = [
-            r'\bapply\s+(?:now|today)\b',
-            r'\begg\s+donor\b',
-            r'\bresearch\s+study\b',
-            r'\bsurvey\b',
-            r'\bfocus\s+group\b',
-            r'\bmodels?\b',
-            r'\bactors?\b',
-            r'\bcastings?\b',
-            r'\bphoto\s*shoot\b',
-            r'hiring\s+immediately',
-            r'start\s+tomorrow',
-            r'\bclean(?:er|ing)\b',
-            r'\broom\s+attendant\b',
-            r'\bwarehouse\b',
-            r'\bdriver\b',
-            r'\bmoving\b',
-            r'\bcaregiver\b',
-            r'\btest\s+(?:study|survey)\b',
-            r'\bonline\s+survey\b',
-            r'\bbeta\s+test',
-            r'\bfocus\s+group\b',
-            r'\bpaid\s+study\b',
-            r'\bresearch\s+participant\b'
-        ]
-
-        return any(re.search(pattern, title, re.IGNORECASE) for pattern in exclude_patterns)
+        return self.exclusion_filter.match(title) is not None
 
-    def get_posting_date(self, url: str) -> Optional[Dict[str, str]]:
+    def get_posting_date(self, url: str, site_code: Optional[str] = None) -> Optional[Dict[str, str]]:
         """Fetch the full posting page and extract the precise date."""
+        host = site_code or urlsplit(url).netloc
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(url, headers=headers, timeout=15)
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for the specific date element
-            date_p = soup.find('p', class_='postinginfo reveal')
-            if date_p and 'Posted' in date_p.text:
-                time_elem = date_p.find('time', class_='date timeago')
-                if time_elem and time_elem.get('datetime'):
-                    return {
-                        'datetime': time_elem['datetime'],
-                        'title': time_elem.get('title', ''),
-                        'relative': time_elem.text.strip()
-                    }
+            with self.metrics.time('stage_seconds', stage='detail_fetch', site=host), \
+                    self.request(url, host, stream=True) as response:
+                date_info = self.date_extractor.extract(response)
+                self.metrics.inc('response_bytes_total', response.raw.tell(), kind='detail', site=host)
+                return date_info
+        except CircuitOpenError as e:
+            self.logger.debug(str(e))
         except Exception as e:
             self.logger.error(f"Error fetching date from posting {url}: {str(e)}")
 
         return None
 
-    def search_site(self, site_name: str, site_code: str) -> List[Dict]:
-        """Search a single Craigslist site."""
-        results = []
-        sections = ['cpg', 'crg', 'ggg']  # computer gigs, creative gigs, general gigs
-
-        for section in sections:
-            url = f"https://{site_code}.craigslist.org/search/{section}"
-            self.logger.info(f"Searching {site_name} - {section}")
+    def lookup_posting_date(self, url: str, site_code: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Get a posting's date info from the detail cache, fetching it on a miss."""
+        pid = posting_id(url) if self.detail_cache else None
+        if pid is not None:
+            date_info = self.detail_cache.get(pid)
+            if date_info:
+                return date_info
+
+        date_info = self.get_posting_date(url, site_code)
+        if date_info and pid is not None:
+            self.detail_cache.put(pid, date_info)
+        return date_info
+
+    @contextmanager
+    def host_slot(self, host: str):
+        """Hold one of a host's concurrent request slots."""
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+
+        with slot:
+            yield
+
+    def count_request(self, outcome: str):
+        with self._request_counts_lock:
+            self.request_counts[outcome] += 1
+
+    def request(self, url: str, host: str, **kwargs) -> requests.Response:
+        """GET a URL from a host with rate limiting, retries and the host's circuit breaker.
+
+        Raises CircuitOpenError if the host's breaker is open, or the last error
+        once transient failures have used up every retry.
+        """
+        policy = self.retry_policy
+        self.count_request('requests')
+
+        for attempt in range(policy.attempts):
+            if self.circuit_breaker.is_open(host):
+                self.count_request('short_circuited')
+                raise CircuitOpenError(f"Circuit open for {host}, skipping {url}")
+            if attempt:
+                self.count_request('retried')
 
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
+                response = self._send(url, host, **kwargs)
+            except policy.RETRY_EXCEPTIONS as e:
+                error = e
+            else:
+                if response.status_code not in policy.RETRY_STATUSES:
+                    self.circuit_breaker.record_success(host)
+                    return response
+                error = requests.HTTPError(f"{response.status_code} response from {url}", response=response)
+                response.close()
+
+            if attempt + 1 < policy.attempts:
+                self.logger.warning(f"Retrying {url} after error: {str(error)}")
+                with self.metrics.time('stage_seconds', stage='retry_backoff', site=host):
+                    time.sleep(policy.delay(attempt))
+
+        self.count_request('failed')
+        if self.circuit_breaker.record_failure(host):
+            self.logger.warning(f"Circuit breaker opened for {host}; skipping it for the rest of the run")
+        raise error
+
+    def _send(self, url: str, host: str, **kwargs) -> requests.Response:
+        """Issue a single rate-limited GET and feed the outcome back to the limiter."""
+        metrics = self.metrics
+        queued = time.perf_counter()
+        with self.host_slot(host):
+            metrics.observe('stage_seconds', time.perf_counter() - queued, stage='slot_wait', site=host)
+            with metrics.time('stage_seconds', stage='rate_limit_wait', site=host):
+                self.rate_limiter.acquire(host)  # Respect rate limits
+            start = time.monotonic()
+            try:
+                response = self.transport.get(url, **kwargs)
+            except requests.RequestException:
+                self.rate_limiter.record(host, None, time.monotonic() - start)
+                metrics.inc('http_responses_total', status='error')
+                raise
+            self.rate_limiter.record(host, response.status_code, response.elapsed.total_seconds(),
+                                     response.headers.get('Retry-After'))
+            metrics.inc('http_responses_total', status=str(response.status_code))
+        return response
+
+    def fetch_listings(self, site_name: str, site_code: str, section: str) -> Optional[List[Dict]]:
+        """Fetch one search section and extract its raw listings, or None on error.
+
+        Up to max_pages result pages are read, newest first. Paging stops early
+        once the oldest listing on a page is one an earlier incremental run
+        already got to, or is older than the age cutoff, so the number of
+        requests follows the number of new postings rather than the listing
+        depth. It also stops at a page shorter than a full one (see page_size),
+        which is the last page of results. A failed later page keeps the
+        listings read so far. Sections whose read stops short of those points
+        are remembered, so that process_listings does not move their mark past
+        the unread postings.
+        """
+        url = f"{self.base_url.format(site=site_code)}/search/{section}"
+        listings = []
+        links = set()
+        complete = False
+
+        for page in range(max(1, self.max_pages)):
+            try:
+                if page == 0:
+                    self.logger.info(f"Searching {site_name} - {section}")
+                page_listings = self.fetch_page(f"{url}?s={len(listings)}" if page else url, site_code)
+            except CircuitOpenError as e:
+                self.logger.debug(str(e))
+                if not page:
+                    return None
+                break
+            except Exception as e:
+                self.logger.error(f"Error searching {site_name} - {section} (page {page + 1}): {str(e)}")
+                if not page:
+                    return None
+                break
+
+            # Postings can shift onto the next page while paging; keep the first copy
+            new_listings = [listing for listing in page_listings if listing['link'] not in links]
+            links.update(listing['link'] for listing in new_listings)
+            listings.extend(new_listings)
+
+            if not new_listings or self.reached_known_listings(site_code, section, page_listings[-1]):
+                complete = True
+                break
+            known_size = self.page_size
+            if page == 0:
+                first_size = len(page_listings)
+            elif not known_size or first_size > known_size:
+                # More results followed the first page, so it was a full one
+                with self._partial_lock:
+                    self.page_size = max(self.page_size or 0, first_size)
+            if len(page_listings) < (known_size or first_size):
+                complete = True
+                break  # Short page: there are no more results
+
+        with self._partial_lock:
+            if complete:
+                self._partial_sections.discard((site_code, section))
+            else:
+                self._partial_sections.add((site_code, section))
+        return listings
+
+    def fetch_page(self, url: str, site_code: str) -> List[Dict]:
+        """Fetch and parse one search results page.
+
+        With a parse pool, the raw page is handed to a pool process, which
+        returns the listings already checked against the exclusion rules and
+        keyword groups (see parse_and_match).
+        """
+        with self.metrics.time('stage_seconds', stage='search_fetch', site=site_code):
+            response = self.request(url, site_code)
+            page = response.content if self.processes > 0 else response.text
+        self.metrics.inc('response_bytes_total', response.raw.tell(), kind='search', site=site_code)
+
+        with self.metrics.time('stage_seconds', stage='search_parse', site=site_code):
+            if self.processes > 0:
+                listings = self.parse_pool().submit(parse_and_match, page, response.encoding or 'utf-8').result()
+            else:
+                listings = self.listing_extractor.extract(page)
+        self.metrics.inc('listings_total', len(listings), site=site_code)
+        return listings
+
+    def parse_pool(self) -> ProcessPoolExecutor:
+        """Return the search page parse pool, starting it on first use."""
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # Spawned rather than forked, since the crawl threads are already running
+                self._parse_pool = ProcessPoolExecutor(
+                    self.processes, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_parse_worker,
+                    initargs=(self.parser, self.keyword_groups, self.exclude_patterns))
+            return self._parse_pool
+
+    def reached_known_listings(self, site_code: str, section: str, listing: Dict) -> bool:
+        """Check whether paging can stop at this listing: already covered by an earlier run, or too old."""
+        if self.seen_store is not None and self.seen_store.is_known(site_code, section, listing['link']):
+            return True
+        return self.is_stale(listing)
+
+    def age_cutoff(self, max_age: Optional[float] = None, since: Optional[float] = None) -> Optional[float]:
+        """Return the epoch time before which postings are stale, or None for no cutoff.
+
+        max_age and since default to the finder's settings; with both, the
+        later cutoff applies.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        since = self.since if since is None else since
+        cutoffs = [since] if since is not None else []
+        if max_age is not None:
+            cutoffs.append(time.time() - max_age)
+        return max(cutoffs) if cutoffs else None
+
+    def posted_no_later_than(self, listing: Dict) -> Optional[float]:
+        """Return an upper bound on a listing's posting time without fetching its posting page.
+
+        Uses the search page's listing time, which is the posting or its
+        latest renewal, and otherwise the posting ID: the cached date of the
+        same or the next newer posting. None when neither is available.
+        """
+        if listing.get('datetime'):
+            posted = parse_timestamp(listing['datetime'])
+            if posted is not None:
+                return posted
+        if self.detail_cache is not None:
+            pid = posting_id(listing['link'])
+            if pid is not None:
+                return self.detail_cache.posted_no_later_than(pid)
+        return None
 
-                response = requests.get(url, headers=headers, timeout=15)
-                soup = BeautifulSoup(response.text, 'html.parser')
+    def is_stale(self, listing: Dict) -> bool:
+        """Check whether a listing is known to be older than the age cutoff."""
+        if self.cutoff_time is None:
+            return False
+        posted = self.posted_no_later_than(listing)
+        return posted is not None and posted < self.cutoff_time
 
-                listings = soup.select('.cl-static-search-result')
+    def process_listings(self, site_name: str, site_code: str, section: str, listings: List[Dict]) -> List[Dict]:
+        """Filter, dedupe and keyword-match the raw listings of one search section."""
+        results = []
+        start = time.perf_counter()
+
+        for position, listing in enumerate(listings):
+            title = listing['title']
+            # Listings from the parse pool are already checked against the
+            # exclusion rules and keyword groups
+            classified = 'categories' in listing
+
+            # Skip if title matches exclusion patterns
+            if self.exclusion_filter.record(listing['excluded_by']) if classified else self.should_exclude(title):
+                continue
+
+            link = listing['link']
+
+            # Skip if it's a duplicate
+            if self.is_duplicate(title, link):
+                continue
+
+            # Check for keyword matches
+            matches = listing['categories'] if classified else self.matches_tech_keywords(title)
+            if matches:
+                # Skip postings older than the age cutoff before any posting page request
+                if self.is_stale(listing):
+                    self.stale_count += 1
+                    continue
+
+                # Skip postings already reported by a previous run
+                if self.seen_store is not None:
+                    keys = self.seen_store.keys_for(link, self.normalize_title(title))
+                    if self.seen_store.contains(keys):
+                        self.previously_seen_count += 1
+                        # Still index it, so its near-duplicates stay suppressed in this run
+                        if self.near_dup_index is not None:
+                            self.near_dup_index.add(link, title)
+                        continue
 
-                for listing in listings:
-                    title_elem = listing.select_one('.title')
-                    if not title_elem:
+                # Skip near-duplicates of postings already found
+                if self.near_dup_index is not None:
+                    original, band_keys = self.near_dup_index.find(title, link)
+                    if original is not None:
+                        self.near_duplicates.append({
+                            'site': site_name,
+                            'title': title,
+                            'link': link,
+                            'duplicate_of': original['link'],
+                            'duplicate_of_title': original['title'],
+                            'similarity': original['similarity'],
+                        })
+                        if self.seen_store is not None:
+                            self.seen_store.add(keys)
                         continue
+                    self.near_dup_index.add(link, title, band_keys)
+
+                if self.seen_store is not None:
+                    self.seen_store.add(keys)
+
+                result = {
+                    'site': site_name,
+                    'title': title,
+                    'link': link,
+                    'location': listing['location'],
+                    'price': listing['price'],
+                    'categories': matches,
+                    'section': section,
+                    'date': date_block(None, listing.get('datetime')),
+                    'date_found': datetime.now().isoformat(),
+                }
+                if self.result_writer is not None:
+                    result['region'] = self.get_region(site_code)
+                if self.shard is not None:
+                    # Lets merge_shards restore the crawl order within a section
+                    result['position'] = position
+
+                # Get detailed date from the full posting, in the background when
+                # the enrichment stage is running
+                if self.enrich and link and self.enricher is not None:
+                    self.enricher.submit(result, site_code)
+                else:
+                    if self.enrich and link:
+                        result['date'] = date_block(self.lookup_posting_date(link, site_code), listing.get('datetime'))
+                    self.finish_result(result)
+
+                results.append(result)
+                self.logger.info(f"Found matching gig: {title}")
+
+        if self.seen_store is not None:
+            with self._partial_lock:
+                complete = (site_code, section) not in self._partial_sections
+            self.seen_store.mark_section(site_code, section, [listing['link'] for listing in listings], complete)
+        self.metrics.observe('stage_seconds', time.perf_counter() - start, stage='process', site=site_code)
+        self.metrics.inc('results_total', len(results), site=site_code)
+        return results
 
-                    title = title_elem.get_text(strip=True)
+    def finish_result(self, result: Dict):
+        """Handle a result whose date lookup is complete."""
+        if self.result_writer is not None:
+            self.result_writer.write(result)
 
-                    # Skip if title matches exclusion patterns
-                    if self.should_exclude(title):
-                        continue
+    def search_site(self, site_name: str, site_code: str) -> List[Dict]:
+        """Search a single Craigslist site."""
+        results = []
 
-                    link_elem = listing.select_one('a')
-                    link = link_elem.get('href', '') if link_elem else ''
+        for section in self.sections:
+            listings = self.fetch_listings(site_name, site_code, section)
+            if listings is not None:
+                results.extend(self.process_listings(site_name, site_code, section, listings))
 
-                    # Skip if it's a duplicate
-                    if self.is_duplicate(title, link):
-                        continue
+        return results
 
-                    # Check for keyword matches
-                    matches = self.matches_tech_keywords(title)
-                    if matches:
-                        location_elem = listing.select_one('.location')
-                        price_elem = listing.select_one('.price')
+    def crawl_sites(self, regions: Optional[List[str]] = None, states: Optional[List[str]] = None) -> List[tuple]:
+        """Return the (site_name, site_code) pairs to crawl, limited to the given regions/states and this shard.
+
+        Region and state names are matched case-insensitively; a site passes
+        if it is in any of the regions or any of the states given.
+        """
+        sites = list(self.craigslist_sites.items())
+
+        if regions or states:
+            wanted_regions = {region.lower() for region in regions or []}
+            wanted_states = {state.lower() for state in states or []}
+            unknown = (wanted_regions - {region.lower() for region in self.config.regions}) | \
+                      (wanted_states - {state.lower() for state in self.config.states})
+            if unknown:
+                raise ValueError(f"Unknown region or state: {', '.join(sorted(unknown))}")
+            sites = [
+                (site_name, site_code) for site_name, site_code in sites
+                if self.get_region(site_code).lower() in wanted_regions
+                or any((state or '').lower() in wanted_states
+                       for state in self.config.site_states.get(site_code, []))
+            ]
 
-                        # Get detailed date from the full posting
-                        date_info = self.get_posting_date(link) if link else None
+        if self.shard is None:
+            return sites
+        index, count = self.shard
+        return [(site_name, site_code) for site_name, site_code in sites if shard_of(site_code, count) == index]
+
+    def crawl_tasks(self, regions: Optional[List[str]] = None, states: Optional[List[str]] = None) -> List[tuple]:
+        """Return every (site_name, site_code, section) search task in crawl order."""
+        return [
+            (site_name, site_code, section)
+            for site_name, site_code in self.crawl_sites(regions, states)
+            for section in self.sections
+        ]
 
-                        result = {
-                            'site': site_name,
-                            'title': title,
-                            'link': link,
-                            'location': location_elem.get_text(strip=True) if location_elem else '',
-                            'price': price_elem.get_text(strip=True) if price_elem else 'Not specified',
-                            'categories': matches,
-                            'section': section,
-                            'date': {
-                                'datetime': date_info['datetime'] if date_info else None,
-                                'formatted': date_info['title'] if date_info else None,
-                                'relative': date_info['relative'] if date_info else None
-                            },
-                            'date_found': datetime.now().isoformat(),
-                        }
-
-                        results.append(result)
-                        self.logger.info(f"Found matching gig: {title} (Posted: {result['date']['datetime']})")
-
-                time.sleep(2)  # Respect rate limits
+    def run_daemon(self, requests_per_hour: float = 1800, min_interval: float = 300,
+                   max_interval: float = 6 * 3600, max_polls: Optional[int] = None,
+                   regions: Optional[List[str]] = None, states: Optional[List[str]] = None):
+        """Keep polling sections on an adaptive schedule, streaming new results to JSONL.
+
+        Sections are polled in order of their next due time, and polls are
+        paced so all HTTP requests, detail fetches included, stay within
+        requests_per_hour. Open circuit breakers are reset hourly so dead
+        sites get retried eventually.
+        """
+        tasks = self.crawl_tasks(regions, states)
+        scheduler = CrawlScheduler(tasks, min_interval, max_interval)
+        request_gap = 3600 / requests_per_hour
+        next_allowed = time.monotonic()
+        last_reset = time.monotonic()
+        polls = 0
 
-            except Exception as e:
-                self.logger.error(f"Error searching {site_name} - {section}: {str(e)}")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self.shard is not None:
+            timestamp += '_shard{}of{}'.format(*self.shard)
+        filename = os.path.join(self.results_dir, f'tech_gigs_daemon_{timestamp}.jsonl')
+        self.result_writer = JsonlResultWriter(filename)
+        if self.enrich and self.detail_workers > 0:
+            self.enricher = DetailEnricher(self.lookup_posting_date, self.detail_workers,
+                                           self.detail_queue_size, on_done=self.finish_result)
+        self.logger.info(f"Starting continuous polling of {len(tasks)} "
+                         f"sections; results stream to {filename}")
+
+        aborted = False
+        try:
+            while max_polls is None or polls < max_polls:
+                due, task = scheduler.pop()
+                wait = max(due, next_allowed) - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+
+                if time.monotonic() - last_reset >= 3600:
+                    self.circuit_breaker.reset()
+                    last_reset = time.monotonic()
+
+                site_name, site_code, section = task
+                requests_before = self.request_counts['requests']
+                self.cutoff_time = self.age_cutoff()
+                listings = self.fetch_listings(site_name, site_code, section)
+                results = self.process_listings(site_name, site_code, section, listings) if listings else []
+                interval = scheduler.record(task, listings)
+                polls += 1
+
+                if self.seen_store is not None:
+                    self.seen_store.commit()
+                if self.near_dup_index is not None:
+                    self.near_dup_index.commit()
+
+                # Pace by the requests this poll made, including queued detail fetches
+                spent = self.request_counts['requests'] - requests_before + len(results)
+                next_allowed = max(next_allowed, time.monotonic()) + spent * request_gap
+                self.logger.info(f"Polled {site_name} - {section}: {len(results)} new gigs, "
+                                 f"next poll in {interval / 60:.0f} min")
+        except BaseException:
+            aborted = True
+            raise
+        finally:
+            if self.enricher is not None:
+                self.enricher.close(wait=not aborted)
+                self.enricher = None
+            self.result_writer.close()
+            self.result_writer = None
+
+    def plan_tasks(self, regions: Optional[List[str]] = None, states: Optional[List[str]] = None) -> List[tuple]:
+        """Return the search tasks for a run, most productive first when the run has a budget.
+
+        Without a budget the canonical config order is kept, so results and
+        duplicate decisions stay reproducible. With one, tasks are ordered by
+        their average results per run; tasks with no history get the mean
+        yield so new markets are still tried.
+        """
+        tasks = self.crawl_tasks(regions, states)
+        if self.yield_store is None or (self.max_requests is None and self.time_budget is None):
+            return tasks
+
+        history = self.yield_store.yields()
+        prior = sum(history.values()) / len(history) if history else 0.0
+        order = {task: i for i, task in enumerate(tasks)}
+        return sorted(tasks, key=lambda task: (-history.get((task[1], task[2]), prior), order[task]))
+
+    def budget_exhausted(self, start_time: float) -> bool:
+        """Check the run's request and time budgets."""
+        if self.max_requests is not None and self.request_counts['requests'] >= self.max_requests:
+            return True
+        return self.time_budget is not None and time.time() - start_time >= self.time_budget
+
+    def iter_task_results(self, tasks: List[tuple], start_time: Optional[float] = None):
+        """Yield (site_name, site_code, section, results) for each search task, in task order.
+
+        Search pages are fetched by a thread pool while listings are processed
+        here in task order, so dedup decisions match a sequential crawl
+        exactly. Fetches are submitted one chunk ahead of processing, so a
+        run that hits its budget stops soon after. Within a chunk, submissions
+        rotate between sites, so consecutive fetches rarely wait on the same
+        site's rate limit.
+        """
+        start_time = time.time() if start_time is None else start_time
+
+        def process(task, listings):
+            site_name, site_code, section = task
+            results = []
+            if listings is not None:
+                results = self.process_listings(site_name, site_code, section, listings)
+                if self.yield_store is not None:
+                    self.yield_store.record(site_code, section, len(listings), len(results))
+            return site_name, site_code, section, results
+
+        if self.max_workers <= 1:
+            for task in tasks:
+                if self.budget_exhausted(start_time):
+                    return
+                yield process(task, self.fetch_listings(*task))
+            return
+
+        chunk_size = self.max_workers * len(self.sections)
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+
+            def submit(chunk):
+                seen = defaultdict(int)
+                rotation = []
+                for task in chunk:
+                    rotation.append((seen[task[1]], len(rotation), task))
+                    seen[task[1]] += 1
+                for _, _, task in sorted(rotation):
+                    futures[task] = executor.submit(self.fetch_listings, *task)
 
-        return results
+            try:
+                if chunks:
+                    submit(chunks[0])
+                for i, chunk in enumerate(chunks):
+                    if i + 1 < len(chunks):
+                        submit(chunks[i + 1])
+                    for task in chunk:
+                        if self.budget_exhausted(start_time):
+                            return
+                        yield process(task, futures.pop(task).result())
+            finally:
+                for future in futures.values():
+                    future.cancel()
 
     def get_region(self, site_code: str) -> str:
         """Determine the region for a given site code."""
-        west_coast = ['sfbay', 'losangeles', 'sandiego', 'seattle', 'portland', 'sacramento', 'lasvegas', 'phoenix']
-        mountain = ['denver', 'boulder', 'saltlakecity', 'albuquerque', 'boise']
-        central = ['austin', 'dallas', 'houston', 'chicago', 'minneapolis', 'kansascity']
-
-        if site_code in west_coast:
-            return 'West Coast'
-        elif site_code in mountain:
-            return 'Mountain'
-        elif site_code in central:
-            return 'Central'
-        else:
-            return 'East Coast'
-
-    def run_search(self) -> Dict:
-        """Run the search across all sites."""
-        self.logger.info("Starting search across Craigslist sites...")
+        return self.config.region_index.get(site_code, self.config.default_region)
+
+    def get_site_info(self, site_code: str) -> Dict[str, Optional[str]]:
+        """Return the region, state and country of a site code."""
+        return self.config.site_index.get(
+            site_code, {'region': self.config.default_region, 'state': None, 'country': None})
+
+    def run_search(self, regions: Optional[List[str]] = None, states: Optional[List[str]] = None,
+                   max_age: Optional[float] = None, since: Optional[float] = None) -> Dict:
+        """Run the search across all sites, or only those in the given regions/states.
+
+        max_age (seconds) and since (epoch time) override the finder's age
+        cutoff for this run. Postings known to be older are skipped without
+        fetching their posting pages.
+        """
+        tasks = self.plan_tasks(regions, states)
+        self.cutoff_time = self.age_cutoff(max_age, since)
+        self.logger.info(f"Starting search across {len({task[1] for task in tasks})} Craigslist sites...")
         start_time = time.time()
+        completed_tasks = 0
+        self.circuit_breaker.reset()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self.shard is not None:
+            timestamp += '_shard{}of{}'.format(*self.shard)
         all_results = []
+        total_results = 0
 
-        # Group results by region for better organization
+        # Group results by region for better organization. Streaming mode only
+        # keeps counts here; the grouping is rebuilt from the JSONL file.
         region_results = defaultdict(list)
+        region_counts = defaultdict(int)
+        region_categories = defaultdict(lambda: defaultdict(int))
+        top_results = []
 
-        for site_name, site_code in self.craigslist_sites.items():
-            results = self.search_site(site_name, site_code)
-            region = self.get_region(site_code)
-            region_results[region].extend(results)
-            all_results.extend(results)
+        if self.stream_results:
+            filename = os.path.join(self.results_dir, f'tech_gigs_{timestamp}.jsonl')
+            self.result_writer = JsonlResultWriter(filename)
+        else:
+            filename = os.path.join(self.results_dir, f'tech_gigs_{timestamp}.json')
 
-        # Sort results by categories (more category matches = more relevant)
-        all_results.sort(key=lambda x: len(x['categories']), reverse=True)
+        if self.enrich and self.detail_workers > 0:
+            self.enricher = DetailEnricher(self.lookup_posting_date, self.detail_workers,
+                                           self.detail_queue_size, on_done=self.finish_result)
 
-        # Save results
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = os.path.join(self.results_dir, f'tech_gigs_{timestamp}.json')
+        aborted = False
+        try:
+            for site_name, site_code, section, results in self.iter_task_results(tasks, start_time):
+                completed_tasks += 1
+                region = self.get_region(site_code)
+                total_results += len(results)
+                region_counts[region] += len(results)
+                for result in results:
+                    for category in result['categories']:
+                        region_categories[region][category] += 1
+
+                if self.result_writer is not None:
+                    top_results = sorted(top_results + results, key=lambda x: len(x['categories']), reverse=True)[:5]
+                else:
+                    region_results[region].extend(results)
+                    all_results.extend(results)
+        except BaseException:
+            aborted = True
+            raise
+        finally:
+            if self.seen_store is not None:
+                self.seen_store.commit()
+            if self.near_dup_index is not None:
+                self.near_dup_index.commit()
+            if self.yield_store is not None:
+                self.yield_store.commit()
+            # The enricher writes results as they finish, so it stops before
+            # the writer closes; after an interrupt, queued results are written
+            # without waiting for their posting pages
+            if self.enricher is not None:
+                self.enricher.close(wait=not aborted)
+                enrichment_stats = self.enricher.stats()
+                self.enricher = None
+            else:
+                enrichment_stats = None
+            result_writer, self.result_writer = self.result_writer, None
+            if aborted and result_writer is not None:
+                # Keep everything streamed so far; the manifest is only written for complete runs
+                result_writer.close()
 
         final_results = {
             'timestamp': datetime.now().isoformat(),
-            'total_results': len(all_results),
+            'total_results': total_results,
             'total_duplicates_skipped': self.duplicate_count,
+            'total_previously_seen': self.previously_seen_count,
+            'total_near_duplicates_skipped': len(self.near_duplicates),
+            'total_stale_skipped': self.stale_count,
+            'age_cutoff': datetime.fromtimestamp(self.cutoff_time).isoformat() if self.cutoff_time else None,
             'search_duration': time.time() - start_time,
-            'results_by_region': {region: results for region, results in region_results.items()},
-            'all_results': all_results
+            'connection_stats': self.transport.stats.snapshot(),
+            'exclusion_stats': self.exclusion_filter.stats(),
+            'enrichment_stats': enrichment_stats,
+            'detail_cache_stats': self.detail_cache.stats() if self.detail_cache else None,
+            'near_duplicates': self.near_duplicates,
+            'detail_parse_stats': self.date_extractor.stats(),
+            'rate_limit_stats': self.rate_limiter.stats(),
+            'metrics': self.metrics.snapshot(),
+            'crawl_plan': {
+                'tasks': len(tasks),
+                'completed': completed_tasks,
+                'ordered_by_yield': self.yield_store is not None and (
+                    self.max_requests is not None or self.time_budget is not None),
+                'budget_exhausted': completed_tasks < len(tasks),
+            },
+            'request_report': {
+                'requests': self.request_counts['requests'],
+                'retried': self.request_counts['retried'],
+                'failed': self.request_counts['failed'],
+                'short_circuited': self.request_counts['short_circuited'],
+                'open_circuits': self.circuit_breaker.open_hosts(),
+            },
         }
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(final_results, f, indent=2)
+        if self.shard is not None:
+            final_results['shard'] = '{}/{}'.format(*self.shard)
+        if self.metrics.enabled:
+            final_results['metrics_file'] = os.path.join(self.results_dir, f'metrics_{timestamp}.prom')
+            with open(final_results['metrics_file'], 'w', encoding='utf-8') as f:
+                f.write(self.metrics.prometheus())
+
+        if result_writer is not None:
+            final_results['results_file'] = filename
+            final_results['results_by_region_counts'] = dict(region_counts)
+            result_writer.close(manifest=final_results)
+        else:
+            # Sort results by categories (more category matches = more relevant)
+            all_results.sort(key=lambda x: len(x['categories']), reverse=True)
+            top_results = all_results[:5]
+
+            final_results['results_by_region'] = {region: results for region, results in region_results.items()}
+            final_results['all_results'] = all_results
+
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(final_results, f, indent=2)
 
         # Print summary
         self.logger.info("\nSearch Summary:")
-        self.logger.info(f"Total unique gigs found: {len(all_results)}")
+        self.logger.info(f"Total unique gigs found: {total_results}")
         self.logger.info(f"Duplicate listings skipped: {self.duplicate_count}")
+        if self.seen_store is not None:
+            self.logger.info(f"Postings seen in previous runs skipped: {self.previously_seen_count}")
+        if self.near_dup_index is not None:
+            self.logger.info(f"Near-duplicate postings skipped: {len(self.near_duplicates)}")
+        if self.cutoff_time is not None:
+            self.logger.info(f"Postings older than {final_results['age_cutoff']} skipped: {self.stale_count}")
         self.logger.info(f"Search duration: {time.time() - start_time:.2f} seconds")
+        if completed_tasks < len(tasks):
+            self.logger.info(f"Budget reached: searched {completed_tasks} of {len(tasks)} site sections")
+        connection_stats = final_results['connection_stats']
+        self.logger.info(f"HTTP requests: {connection_stats['requests']} "
+                         f"({connection_stats['new_connections']} new connections, "
+                         f"{connection_stats['reused_connections']} reused)")
         self.logger.info(f"Results saved to: {filename}")
+        if final_results['metrics']:
+            self.logger.info(f"Metrics saved to: {final_results['metrics_file']}")
+            for stage, total in final_results['metrics']['stage_totals'].items():
+                self.logger.info(f"  {stage}: {total['seconds']:.2f}s over {total['count']} calls")
+        request_report = final_results['request_report']
+        self.logger.info(f"Requests: {request_report['requests']} "
+                         f"({request_report['retried']} retries, {request_report['failed']} failed, "
+                         f"{request_report['short_circuited']} skipped by open circuits)")
+        if request_report['open_circuits']:
+            self.logger.info(f"Open circuits: {', '.join(request_report['open_circuits'])}")
+        rate_limit_stats = final_results['rate_limit_stats']
+        self.logger.info(f"Rate limiting: {rate_limit_stats['throttled_requests']} requests delayed "
+                         f"{rate_limit_stats['total_wait']:.1f}s in total, "
+                         f"{rate_limit_stats['host_backoffs']} host backoffs")
+        detail_parse_stats = final_results['detail_parse_stats']
+        if detail_parse_stats['fallbacks']:
+            self.logger.warning(f"Posting date block not recognized on {detail_parse_stats['fallbacks']} "
+                                f"detail pages; used full-page parsing instead")
+
+        # Print exclusion rule hits so dead rules are easy to spot
+        exclusion_stats = final_results['exclusion_stats']
+        self.logger.info(f"\nExcluded {exclusion_stats['rejected']} of {exclusion_stats['checked']} listings:")
+        for rule, count in exclusion_stats['rejected_by_rule'].items():
+            self.logger.info(f"  {rule}: {count}")
 
         # Print results by region
-        for region, results in region_results.items():
-            self.logger.info(f"\n{region} - {len(results)} gigs found")
-            category_counts = defaultdict(int)
-            for result in results:
-                for category in result['categories']:
-                    category_counts[category] += 1
-            for category, count in category_counts.items():
-                self.logger.info(f"  {category}: {count} gigs")
+        for region, count in region_counts.items():
+            self.logger.info(f"\n{region} - {count} gigs found")
+            for category, category_count in region_categories[region].items():
+                self.logger.info(f"  {category}: {category_count} gigs")
 
         # Print top results
         self.logger.info("\nTop matching gigs:")
-        for result in all_results[:5]:
+        for result in top_results:
             self.logger.info("\n" + "=" * 50)
             self.logger.info(f"Site: {result['site']} ({result['section']})")
             self.logger.info(f"Title: {result['title']}")
@@ -840,17 +2599,262 @@ class CraigslistGigFinder:
 
         return final_results
 
+    def merge_shards(self, paths: List[str]) -> Dict:
+        """Combine shard result files into one run_search result file.
+
+        Results are replayed in the full crawl's site/section order through
+        the same duplicate (and near-duplicate) checks, so the merged output
+        keeps the same postings a single unsharded run would have kept. Only
+        matching postings reach the shard files, so total_duplicates_skipped
+        misses repeats of non-tech listings that fell on different shards.
+        """
+        site_order = {site_name: i for i, site_name in enumerate(self.craigslist_sites)}
+        section_order = {section: i for i, section in enumerate(self.sections)}
+        shards = [load_results(path) for path in paths]
+
+        candidates = [result for shard in shards for result in shard['all_results']]
+        candidates.sort(key=lambda x: (site_order.get(x['site'], len(site_order)),
+                                       section_order.get(x['section'], len(section_order)),
+                                       x.get('position', 0)))
+
+        all_results = []
+        region_results = defaultdict(list)
+        for site_code in self.craigslist_sites.values():
+            region_results[self.get_region(site_code)]
+        for result in candidates:
+            result.pop('position', None)
+            result.pop('region', None)
+            if self.is_duplicate(result['title'], result['link']):
+                continue
+            if self.near_dup_index is not None:
+                original, band_keys = self.near_dup_index.find(result['title'], result['link'])
+                if original is not None:
+                    self.near_duplicates.append({
+                        'site': result['site'],
+                        'title': result['title'],
+                        'link': result['link'],
+                        'duplicate_of': original['link'],
+                        'duplicate_of_title': original['title'],
+                        'similarity': original['similarity'],
+                    })
+                    continue
+                self.near_dup_index.add(result['link'], result['title'], band_keys)
+
+            region_results[self.get_region(self.craigslist_sites.get(result['site'], ''))].append(result)
+            all_results.append(result)
+
+        all_results.sort(key=lambda x: len(x['categories']), reverse=True)
+        near_duplicates = [entry for shard in shards for entry in shard.get('near_duplicates', [])]
+        near_duplicates.extend(self.near_duplicates)
+
+        crawl_plan = sum_stats([shard.get('crawl_plan') for shard in shards])
+        if crawl_plan is not None:
+            crawl_plan['ordered_by_yield'] = any(shard.get('crawl_plan', {}).get('ordered_by_yield') for shard in shards)
+            crawl_plan['budget_exhausted'] = any(shard.get('crawl_plan', {}).get('budget_exhausted') for shard in shards)
+        age_cutoffs = [shard['age_cutoff'] for shard in shards if shard.get('age_cutoff')]
+        shard_metrics = [shard['metrics'] for shard in shards if shard.get('metrics')]
+        metrics = Metrics.from_snapshots(shard_metrics) if shard_metrics else NullMetrics()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        final_results = {
+            'timestamp': datetime.now().isoformat(),
+            'total_results': len(all_results),
+            'total_duplicates_skipped': sum(shard.get('total_duplicates_skipped', 0) for shard in shards)
+                                        + self.duplicate_count,
+            'total_previously_seen': sum(shard.get('total_previously_seen', 0) for shard in shards),
+            'total_near_duplicates_skipped': len(near_duplicates),
+            'total_stale_skipped': sum(shard.get('total_stale_skipped', 0) for shard in shards),
+            # Every merged posting is newer than the earliest shard cutoff
+            'age_cutoff': min(age_cutoffs) if age_cutoffs else None,
+            # Shards run side by side, so the slowest one bounds the crawl
+            'search_duration': max((shard.get('search_duration', 0) for shard in shards), default=0),
+            'shards': [shard.get('shard') for shard in shards],
+            'connection_stats': sum_stats([shard.get('connection_stats') for shard in shards]),
+            'exclusion_stats': sum_stats([shard.get('exclusion_stats') for shard in shards]),
+            'enrichment_stats': sum_stats([shard.get('enrichment_stats') for shard in shards]),
+            'detail_cache_stats': sum_stats([shard.get('detail_cache_stats') for shard in shards]),
+            'near_duplicates': near_duplicates,
+            'detail_parse_stats': sum_stats([shard.get('detail_parse_stats') for shard in shards]),
+            'rate_limit_stats': sum_stats([shard.get('rate_limit_stats') for shard in shards]),
+            'metrics': metrics.snapshot(),
+            'crawl_plan': crawl_plan,
+            'request_report': sum_stats([shard.get('request_report') for shard in shards]),
+        }
+        if metrics.enabled:
+            final_results['metrics_file'] = os.path.join(self.results_dir, f'metrics_{timestamp}_merged.prom')
+            with open(final_results['metrics_file'], 'w', encoding='utf-8') as f:
+                f.write(metrics.prometheus())
+        final_results['results_by_region'] = dict(region_results)
+        final_results['all_results'] = all_results
+
+        filename = os.path.join(self.results_dir, f'tech_gigs_{timestamp}_merged.json')
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(final_results, f, indent=2)
+
+        self.logger.info(f"Merged {len(paths)} shard files: {len(all_results)} unique gigs "
+                         f"({self.duplicate_count} cross-shard duplicates skipped)")
+        self.logger.info(f"Results saved to: {filename}")
+        return final_results
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description='Search Craigslist gig sections for tech gigs.')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='maximum concurrent search page fetches (1 = sequential crawl)')
+    parser.add_argument('--per-host', type=int, default=1,
+                        help='maximum concurrent requests to a single Craigslist site')
+    parser.add_argument('--delay', type=float, default=2.0,
+                        help='initial seconds between requests to the same site')
+    parser.add_argument('--max-host-rate', type=float, default=2.0,
+                        help='requests per second a site may ramp up to while it responds well')
+    parser.add_argument('--global-rate', type=float, default=20.0,
+                        help='maximum requests per second across all sites')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='retries for timeouts, connection errors and 429/5xx responses')
+    parser.add_argument('--failure-threshold', type=int, default=3,
+                        help='consecutive failed requests before a site is skipped for the rest of the run')
+    parser.add_argument('--no-enrich', action='store_true',
+                        help='skip detail-page date enrichment for a fast discovery-only sweep')
+    parser.add_argument('--detail-workers', type=int, default=4,
+                        help='worker threads fetching posting detail pages (0 = fetch inline)')
+    parser.add_argument('--cache', default='default',
+                        help='posting date cache file (default: gig_finder_results/posting_cache.sqlite)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always fetch posting pages instead of using the date cache')
+    parser.add_argument('--cache-ttl', type=float, default=30,
+                        help='days to keep cached posting dates')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only report postings not seen by previous incremental runs')
+    parser.add_argument('--seen-store',
+                        help='seen posting store file (default: gig_finder_results/seen_postings.sqlite)')
+    parser.add_argument('--near-dup-threshold', type=float,
+                        help='skip postings whose title is at least this similar (Jaccard, 0-1) to an earlier one')
+    parser.add_argument('--near-dup-store',
+                        help='SQLite file keeping near-duplicate fingerprints across runs (default: this run only)')
+    parser.add_argument('--dedup-capacity', type=int,
+                        help='use fixed-memory Bloom filters sized for this many postings instead of exact dedup sets')
+    parser.add_argument('--dedup-max-age', type=float, default=168,
+                        help='hours before the fixed-memory dedup filters forget a posting')
+    parser.add_argument('--stream', action='store_true',
+                        help='append results to a JSONL file as they are found instead of one JSON file at the end')
+    parser.add_argument('--parser', default='auto', choices=['auto'] + list(LISTING_EXTRACTORS),
+                        help='search result page parser (auto = lxml when installed)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='keep polling sections on an adaptive schedule instead of running one sweep')
+    parser.add_argument('--requests-per-hour', type=float, default=1800,
+                        help='daemon mode: total HTTP request budget')
+    parser.add_argument('--min-interval', type=float, default=5,
+                        help='daemon mode: minutes between polls of the busiest sections')
+    parser.add_argument('--max-interval', type=float, default=360,
+                        help='daemon mode: minutes between polls of the quietest sections')
+    parser.add_argument('--shard', type=parse_shard,
+                        help='only crawl shard K of N (e.g. 3/8); sites are split by a stable hash of their code')
+    parser.add_argument('--merge', nargs='+', metavar='RESULTS_FILE',
+                        help='merge shard result files into one results file instead of crawling')
+    parser.add_argument('--base-url', default='https://{site}.craigslist.org',
+                        help='site root URL template; {site} is replaced by the site code')
+    parser.add_argument('--metrics', action='store_true',
+                        help='record per-stage latency histograms and counters (saved as JSON and Prometheus text)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='serve live metrics at http://127.0.0.1:PORT/metrics (implies --metrics)')
+    parser.add_argument('--region', action='append', dest='regions', metavar='REGION',
+                        help='only crawl sites in this region, e.g. "West Coast" (may be repeated)')
+    parser.add_argument('--state', action='append', dest='states', metavar='STATE',
+                        help='only crawl sites in this state or province, e.g. Oregon (may be repeated)')
+    parser.add_argument('--max-requests', type=int,
+                        help='stop after about this many HTTP requests, searching the most productive sections first')
+    parser.add_argument('--time-budget', type=float,
+                        help='stop after this many minutes, searching the most productive sections first')
+    parser.add_argument('--yield-store',
+                        help='per-section result history file (default: gig_finder_results/crawl_yield.sqlite)')
+    parser.add_argument('--no-yield-store', action='store_true',
+                        help='do not record or use per-section result history')
+    parser.add_argument('--max-pages', type=int, default=1,
+                        help='search result pages to read per section; paging stops early at postings '
+                             'an earlier --incremental run already got to')
+    parser.add_argument('--page-size', type=int,
+                        help='listings on a full search result page; a shorter page is the last one '
+                             '(default: learned during the crawl)')
+    parser.add_argument('--max-age', type=float,
+                        help='hours; skip postings older than this without fetching their posting pages, '
+                             'and stop paging at them')
+    parser.add_argument('--since', type=parse_since,
+                        help="skip postings from before this local date or time ('YYYY-MM-DD [HH:MM]'), "
+                             'like --max-age')
+    parser.add_argument('--config',
+                        help='sites, regions, keyword groups and exclusion rules (default: config.json next to main.py)')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='parse search pages and match keywords in this many worker processes '
+                             '(default 0: in the crawl threads)')
+    parser.add_argument('--pool-hosts', type=int, default=400,
+                        help='number of per-host keep-alive connection pools to keep open')
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help='maximum keep-alive connections kept per host')
+    return parser.parse_args(argv)
+
 
 def main():
-    finder = CraigslistGigFinder()
+    args = parse_args()
+    finder = CraigslistGigFinder(
+        max_workers=args.workers,
+        per_host_limit=args.per_host,
+        request_delay=args.delay,
+        max_host_rate=args.max_host_rate,
+        global_rate=args.global_rate,
+        retries=args.retries,
+        failure_threshold=args.failure_threshold,
+        pool_connections=args.pool_hosts,
+        pool_maxsize=args.pool_size,
+        enrich=not args.no_enrich,
+        detail_workers=args.detail_workers,
+        cache_path=None if args.no_cache else args.cache,
+        cache_ttl=args.cache_ttl * 86400,
+        incremental=args.incremental,
+        seen_store_path=args.seen_store,
+        stream_results=args.stream,
+        parser=args.parser,
+        near_dup_threshold=args.near_dup_threshold,
+        near_dup_path=args.near_dup_store,
+        dedup_capacity=args.dedup_capacity,
+        dedup_max_age=args.dedup_max_age * 3600,
+        shard=args.shard,
+        base_url=args.base_url,
+        metrics=args.metrics or args.metrics_port is not None,
+        config_path=args.config,
+        max_requests=args.max_requests,
+        time_budget=args.time_budget * 60 if args.time_budget is not None else None,
+        yield_store_path=None if args.no_yield_store else args.yield_store or 'default',
+        max_pages=args.max_pages,
+        max_age=args.max_age * 3600 if args.max_age is not None else None,
+        since=args.since,
+        processes=args.processes,
+        page_size=args.page_size,
+    )
     try:
-        results = finder.run_search()
-        print(f"\nSearch completed successfully. Found {results['total_results']} gigs.")
+        if args.metrics_port is not None:
+            finder.serve_metrics(args.metrics_port)
+        if args.merge:
+            results = finder.merge_shards(args.merge)
+            print(f"\nMerge completed successfully. Found {results['total_results']} gigs.")
+        elif args.daemon:
+            finder.run_daemon(
+                requests_per_hour=args.requests_per_hour,
+                min_interval=args.min_interval * 60,
+                max_interval=args.max_interval * 60,
+                regions=args.regions,
+                states=args.states,
+            )
+        else:
+            results = finder.run_search(regions=args.regions, states=args.states)
+            print(f"\nSearch completed successfully. Found {results['total_results']} gigs.")
     except KeyboardInterrupt:
         print("\nSearch interrupted by user.")
     except Exception as e:
         print(f"\nAn error occurred: {str(e)}")
         logging.exception("Unexpected error in main execution")
+    finally:
+        finder.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from main import DEFAULT_CONFIG_PATH, ConfigError, GigFinderConfig
+
+
+def load_data():
+    with open(DEFAULT_CONFIG_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_site_codes_are_labelled_with_their_own_state():
+    config = GigFinderConfig(load_data(), 'test')
+    assert config.site_index['victoria']['state'] == 'British Columbia'
+    assert config.site_index['victoriatx']['state'] == 'Texas'
+    assert config.site_index['greenville']['state'] == 'South Carolina'
+    assert config.site_index['bloomington']['state'] == 'Indiana'
+    assert config.site_states['quadcities'] == ['Illinois', 'Iowa']
+
+
+def test_code_under_two_states_must_be_shared():
+    data = load_data()
+    data['shared_sites'] = []
+    with pytest.raises(ConfigError, match='quadcities'):
+        GigFinderConfig(data, 'test')
@@ -0,0 +1,30 @@
+from unittest import mock
+
+from main import CrawlScheduler
+
+TASK = ('Susanville', 'susanville', 'cpg')
+
+
+def listing(pid):
+    return {'link': f'https://susanville.craigslist.org/cpg/d/gig/{pid}.html'}
+
+
+def poll(scheduler, listings, clock):
+    scheduler.pop()
+    with mock.patch('main.time.monotonic', return_value=clock):
+        return scheduler.record(TASK, listings)
+
+
+def test_always_empty_section_backs_off_to_max_interval():
+    scheduler = CrawlScheduler([TASK], min_interval=300, max_interval=21600)
+    intervals = [poll(scheduler, [], 1000.0 * i) for i in range(1, 6)]
+    assert intervals[0] == 300  # No history yet
+    assert intervals[-1] == 21600
+
+
+def test_empty_section_that_gets_postings_speeds_up():
+    scheduler = CrawlScheduler([TASK], min_interval=300, max_interval=21600)
+    poll(scheduler, [], 1000.0)
+    poll(scheduler, [], 2000.0)
+    interval = poll(scheduler, [listing(pid) for pid in range(100, 130)], 3000.0)
+    assert interval < 21600
@@ -0,0 +1,35 @@
+import logging
+
+from main import CraigslistGigFinder
+
+LISTINGS = [
+    {'title': 'WordPress developer needed for small business site', 'location': '', 'price': '', 'datetime': None,
+     'link': 'https://sfbay.craigslist.org/cpg/d/a/7712345678.html'},
+    {'title': 'WordPress developer needed for our small business site', 'location': '', 'price': '', 'datetime': None,
+     'link': 'https://oakland.craigslist.org/cpg/d/b/7712399999.html'},
+]
+
+
+def run(seen_path):
+    finder = CraigslistGigFinder(enrich=False, cache_path=None, yield_store_path=None, incremental=True,
+                                 seen_store_path=seen_path, near_dup_threshold=0.75)
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        results = finder.process_listings('SF Bay Area', 'sfbay', 'cpg', [dict(listing) for listing in LISTINGS])
+        finder.seen_store.commit()
+        return [result['link'] for result in results], finder.near_duplicates
+    finally:
+        finder.close()
+
+
+def test_near_duplicates_stay_suppressed_in_later_incremental_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    seen_path = str(tmp_path / 'seen.sqlite')
+
+    links, near_duplicates = run(seen_path)
+    assert links == [LISTINGS[0]['link']]
+    assert [entry['link'] for entry in near_duplicates] == [LISTINGS[1]['link']]
+
+    links, near_duplicates = run(seen_path)
+    assert links == []
+    assert near_duplicates == []
@@ -0,0 +1,51 @@
+import glob
+import os
+
+import pytest
+
+from main import LISTING_EXTRACTORS, lxml_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+SEARCH_FIXTURES = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'search_*.html')))
+
+
+def read_fixture(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_edge_cases_are_extracted_as_expected():
+    listings = LISTING_EXTRACTORS['soup']().extract(read_fixture(os.path.join(FIXTURES_DIR, 'search_edge_cases.html')))
+
+    assert [listing['title'] for listing in listings] == [
+        'WordPress developerneeded',            # <script> content dropped
+        'React Nativeapphelp',                  # <style> content dropped
+        'Pythonscript & scraper <urgent>\xa0!',  # comment dropped, entities decoded
+        'Shopifystore setup',                   # CDATA and <template> dropped
+        'Logo\n                design',
+        'No link: full stack developer for MVP',
+        'Uppercase iOS gig',
+    ]
+    assert [listing['datetime'] for listing in listings] == [
+        '2024-03-01 09:15', '2024-03-01T08:40:00-0800', '', '2024-02-29 23:59', None, None, '2024-02-28 12:00',
+    ]
+    assert listings[1]['location'] == 'berkeley'
+    assert listings[3]['price'] == '$80'
+    assert listings[4]['price'] == 'Not specified'
+    assert listings[5]['link'] == ''
+    assert listings[5]['location'] == 'oakland'
+
+
+@pytest.mark.skipif(lxml_html is None, reason='lxml is not installed')
+@pytest.mark.parametrize('path', SEARCH_FIXTURES, ids=os.path.basename)
+def test_soup_and_lxml_agree(path):
+    html = read_fixture(path)
+    expected = LISTING_EXTRACTORS['soup']().extract(html)
+    assert expected
+    assert LISTING_EXTRACTORS['lxml']().extract(html) == expected
+
+
+@pytest.mark.skipif(lxml_html is None, reason='lxml is not installed')
+def test_empty_page_has_no_listings():
+    for name in ('soup', 'lxml'):
+        assert LISTING_EXTRACTORS[name]().extract('') == []
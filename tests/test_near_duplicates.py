@@ -0,0 +1,31 @@
+from main import NearDuplicateIndex
+
+
+def test_reseen_posting_is_not_its_own_near_duplicate(tmp_path):
+    path = str(tmp_path / 'near_dups.sqlite')
+    link = 'https://sfbay.craigslist.org/sfc/cpg/d/wordpress-help/7712345678.html'
+    title = 'WordPress developer needed for small business site'
+
+    index = NearDuplicateIndex(path, threshold=0.75)
+    assert index.find(title, link)[0] is None
+    index.add(link, title)
+    index.close()
+
+    # A later run sees the same posting again, under its link or another URL for the same ID
+    index = NearDuplicateIndex(path, threshold=0.75)
+    assert index.find(title, link)[0] is None
+    assert index.find(title, 'https://sfbay.craigslist.org/cpg/d/x/7712345678.html')[0] is None
+    index.add(link, title)
+    assert index._conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0] == 1
+    index.close()
+
+
+def test_repost_under_another_id_is_still_found(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'near_dups.sqlite'), threshold=0.75)
+    index.add('https://sfbay.craigslist.org/cpg/d/a/7712345678.html',
+              'WordPress developer needed for small business site')
+    original, _ = index.find('Wordpress developer needed for small business site!!',
+                          'https://oakland.craigslist.org/cpg/d/b/7712399999.html')
+    assert original['link'] == 'https://sfbay.craigslist.org/cpg/d/a/7712345678.html'
+    assert original['similarity'] == 1.0
+    index.close()
@@ -0,0 +1,47 @@
+import logging
+
+from main import CraigslistGigFinder
+
+
+def listing(pid):
+    return {'title': f'Gig {pid}', 'location': '', 'price': '', 'datetime': None,
+            'link': f'https://sfbay.craigslist.org/cpg/d/gig/{pid}.html'}
+
+
+def crawl(monkeypatch, tmp_path, sections, page_size=None):
+    """Read each section's pages through fetch_listings; return the listings and URLs requested."""
+    monkeypatch.chdir(tmp_path)
+    finder = CraigslistGigFinder(enrich=False, cache_path=None, yield_store_path=None,
+                                 max_pages=5, page_size=page_size)
+    logging.getLogger().setLevel(logging.WARNING)
+    requested = []
+
+    def fetch_page(url, site_code):
+        requested.append(url)
+        section, _, offset = url.rpartition('/')[2].partition('?s=')
+        return sections[section][int(offset or 0):][:3]
+
+    monkeypatch.setattr(finder, 'fetch_page', fetch_page)
+    try:
+        found = {section: finder.fetch_listings('SF Bay Area', 'sfbay', section) for section in sections}
+        return found, requested, finder
+    finally:
+        finder.close()
+
+
+def test_short_first_page_ends_the_section(monkeypatch, tmp_path):
+    sections = {'cpg': [listing(pid) for pid in range(2)], 'crg': [listing(pid) for pid in range(10, 12)]}
+    found, requested, finder = crawl(monkeypatch, tmp_path, sections, page_size=3)
+    assert found == sections
+    assert len(requested) == 2
+    assert not finder._partial_sections
+
+
+def test_page_size_is_learned_from_a_followed_page(monkeypatch, tmp_path):
+    sections = {'cpg': [listing(pid) for pid in range(7)], 'crg': [listing(pid) for pid in range(10, 12)]}
+    found, requested, finder = crawl(monkeypatch, tmp_path, sections)
+    assert found == sections
+    # cpg reads pages of 3, 3 and 1; crg's short first page is then known to be its last
+    assert len(requested) == 4
+    assert finder.page_size == 3
+    assert not finder._partial_sections
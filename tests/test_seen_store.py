@@ -0,0 +1,36 @@
+from main import SeenStore
+
+
+def link(pid):
+    return f'https://sfbay.craigslist.org/cpg/d/gig/{pid}.html'
+
+
+def test_committed_marks_are_used_in_process(tmp_path):
+    store = SeenStore(str(tmp_path / 'seen.sqlite'))
+    store.mark_section('sfbay', 'cpg', [link(100), link(90)])
+    store.commit()
+    assert store.is_known('sfbay', 'cpg', link(95))
+    assert not store.is_known('sfbay', 'cpg', link(101))
+    assert not store.is_known('sfbay', 'ggg', link(95))
+    store.close()
+
+
+def test_mark_only_rises_when_the_read_reached_it(tmp_path):
+    store = SeenStore(str(tmp_path / 'seen.sqlite'))
+    store.mark_section('sfbay', 'cpg', [link(100)])
+    store.commit()
+
+    # Paging stopped at max_pages above the mark: 101-149 were never read
+    store.mark_section('sfbay', 'cpg', [link(200), link(150)], complete=False)
+    store.commit()
+    assert not store.is_known('sfbay', 'cpg', link(120))
+
+    # A later read that gets down to the mark covers the gap
+    store.mark_section('sfbay', 'cpg', [link(210), link(100)])
+    store.commit()
+    assert store.is_known('sfbay', 'cpg', link(120))
+    store.close()
+
+    reopened = SeenStore(str(tmp_path / 'seen.sqlite'))
+    assert reopened.is_known('sfbay', 'cpg', link(210))
+    reopened.close()